@@ -0,0 +1,58 @@
+# benchmarks/hashing_contrasenas.py
+
+"""
+Costo de verificar una contraseña con cada configuración de hash.
+
+Reporta, en un solo hilo, los milisegundos por verificación y cuántos
+logins por segundo puede atender un núcleo. Sirve para elegir los
+parámetros CONTRASENAS_* de config.py según el tiempo de login aceptable
+y los núcleos disponibles.
+
+Uso desde consola:
+    python -m benchmarks.hashing_contrasenas
+    python -m benchmarks.hashing_contrasenas --repeticiones 20
+"""
+
+import argparse
+import time
+
+from config import CONTRASENAS_ALGORITMO
+from servicios.hashing import Hasher, HasherPBKDF2, HasherScrypt, crear_hasher
+
+CONFIGURACIONES: list[tuple[str, Hasher]] = [
+    ("pbkdf2_sha256 100.000 iteraciones", HasherPBKDF2(100_000)),
+    ("pbkdf2_sha256 300.000 iteraciones", HasherPBKDF2(300_000)),
+    ("pbkdf2_sha256 600.000 iteraciones", HasherPBKDF2(600_000)),
+    ("scrypt N=2^14 r=8 p=1 (16 MB)", HasherScrypt(2**14, 8, 1)),
+    ("scrypt N=2^15 r=8 p=1 (32 MB)", HasherScrypt(2**15, 8, 1)),
+    ("scrypt N=2^16 r=8 p=1 (64 MB)", HasherScrypt(2**16, 8, 1)),
+    ("scrypt N=2^17 r=8 p=1 (128 MB)", HasherScrypt(2**17, 8, 1)),
+]
+
+
+def medir(hasher: Hasher, repeticiones: int) -> float:
+    """
+    Segundos promedio de una verificación correcta.
+    """
+    codificado = hasher.hashear("contraseña de prueba")
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        hasher.verificar("contraseña de prueba", codificado)
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Costo del hash de contraseñas")
+    parser.add_argument("--repeticiones", type=int, default=10,
+                        help="verificaciones por configuración")
+    args = parser.parse_args()
+
+    print(f"Configuración actual: {crear_hasher(CONTRASENAS_ALGORITMO)!r}")
+    print(f"{'Configuración':<36} {'ms/login':>10} {'logins/s por núcleo':>20}")
+    for nombre, hasher in CONFIGURACIONES:
+        segundos = medir(hasher, args.repeticiones)
+        print(f"{nombre:<36} {segundos * 1000:>10.1f} {1 / segundos:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/memoria_modelos.py
+
+"""
+Memoria que ocupan las instancias de los modelos.
+
+Compara cada clase de modelos/ (dataclass con slots) con una copia
+equivalente sin slots (con __dict__ por instancia), creando N instancias
+de cada una y midiendo la memoria con tracemalloc.
+
+Uso desde consola:
+    python -m benchmarks.memoria_modelos               # 1.000.000 instancias
+    python -m benchmarks.memoria_modelos --n 100000
+"""
+
+import argparse
+import dataclasses
+import gc
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, datetime
+
+from modelos.cliente import Cliente
+from modelos.contrato import ContratoPlan
+from modelos.empresa import Empresa
+from modelos.indicadores import ConsultaIndicador, IndicadorEconomico
+from modelos.plan import Plan
+from modelos.usuario import RolUsuario, Usuario
+
+# Valores de ejemplo por modelo. Son objetos compartidos: se mide el costo
+# de las instancias, no el de sus campos.
+_HOY = date(2025, 1, 10)
+_AHORA = datetime(2025, 1, 10, 12, 0, 0)
+EJEMPLOS: dict[type, dict] = {
+    Cliente: dict(nombre="Cliente", rut="11.111.111-1", email="c@x.cl", telefono="+56 9"),
+    Plan: dict(empresa_id=1, nombre="Plan", bajada_mbps=600.0, subida_mbps=300.0,
+               contencion=1, precio_clp=19990, descripcion=""),
+    ContratoPlan: dict(cliente_id=1, plan_id=1, fecha_inicio=_HOY, fecha_fin=None,
+                       estado="activo"),
+    IndicadorEconomico: dict(nombre="UF", fecha_valor=_HOY, valor=38000.5),
+    ConsultaIndicador: dict(indicador_id=1, usuario_id=1, fecha_consulta=_AHORA,
+                            fuente="cache"),
+    Usuario: dict(nombre_usuario="usuario", contrasena="hash", rol=RolUsuario.CLIENTE),
+    Empresa: dict(nombre="ISP", rut="76.000.000-0", email_contacto="isp@x.cl"),
+}
+
+
+def sin_slots(modelo: type) -> type:
+    """
+    Copia de 'modelo' como dataclass normal (con __dict__), para comparar.
+    """
+    campos = [(f.name, f.type, f) for f in dataclasses.fields(modelo)]
+    return dataclasses.make_dataclass(f"{modelo.__name__}SinSlots", campos)
+
+
+def medir(constructor: Callable[..., object], valores: dict, n: int) -> int:
+    """
+    Bytes que ocupan 'n' instancias creadas con constructor(id=i, **valores).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        instancias = [constructor(id=i, **valores) for i in range(n)]
+        total = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    del instancias
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memoria por instancia de los modelos")
+    parser.add_argument("--n", type=int, default=1_000_000, help="instancias por modelo")
+    args = parser.parse_args()
+
+    print(f"{'Modelo':<20} {'sin slots':>12} {'con slots':>12} {'ahorro':>8}  (MB por {args.n:,})")
+    for modelo, valores in EJEMPLOS.items():
+        antes = medir(sin_slots(modelo), valores, args.n)
+        despues = medir(modelo, valores, args.n)
+        print(
+            f"{modelo.__name__:<20} {antes / 2**20:>12.1f} {despues / 2**20:>12.1f} "
+            f"{1 - despues / antes:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ Aquí se definen constantes como:
 - Parámetros generales de la aplicación.
 """
 
+import os
 from pathlib import Path
 
 # Directorio base del proyecto (carpeta donde está config.py)
@@ -20,6 +21,180 @@ DB_PATH = BASE_DIR / "ispplus.db"
 # URL base de la API de indicadores económicos (ejemplo, reemplazar por la real)
 API_INDICADORES_BASE_URL = "https://api.ejemplo.com/indicadores"
 
+# Cliente HTTP de indicadores (integraciones/indicadores_client.py)
+# - Timeouts en segundos: (conexión, lectura).
+# - Reintentos ante errores 5xx, timeouts y fallas de conexión, con espera
+#   exponencial: BACKOFF, 2*BACKOFF, 4*BACKOFF, ...
+# - POOL: conexiones keep-alive que se mantienen abiertas hacia la API.
+API_INDICADORES_TIMEOUT = (3.05, 5.0)
+API_INDICADORES_REINTENTOS = 3
+API_INDICADORES_BACKOFF = 0.5
+API_INDICADORES_POOL = 10
+
+# Consultas de varios indicadores o fechas a la vez:
+# - SOPORTA_RANGO: la API tiene el endpoint /NOMBRE/desde/hasta. Si responde
+#   405/501 se deja de usar y se consulta fecha por fecha.
+# - MAX_WORKERS: consultas simultáneas cuando hay que ir fecha por fecha.
+API_INDICADORES_SOPORTA_RANGO = True
+API_INDICADORES_MAX_WORKERS = 8
+
+# Tiempo máximo (segundos) de una consulta en AsyncIndicadoresClient,
+# incluyendo reintentos. Al vencer, la consulta se cancela con TimeoutError.
+API_INDICADORES_TIMEOUT_TOTAL = 30.0
+
+# Caché de indicadores (servicios/indicadores_service.py)
+# - Valores de fechas pasadas: no cambian, se guardan sin expiración.
+# - Valores de hoy: expiran según INDICADORES_TTL_HOY (segundos). None
+#   significa que el valor del día es fijo y basta con tenerlo en la BD.
+INDICADORES_CACHE_CAPACIDAD = 4096
+INDICADORES_TTL_HOY = {
+    "UF": None,
+    "UTM": None,
+    "DOLAR": 15 * 60,
+    "EURO": 15 * 60,
+}
+INDICADORES_TTL_HOY_DEFECTO = 60 * 60
+
+# Fechas pasadas que la API no tiene (fines de semana, feriados): se
+# recuerdan este tiempo (segundos) para que obtener_rango() no las vuelva
+# a pedir en cada llamada. Acota cuánto tarda en verse un valor publicado
+# con atraso.
+INDICADORES_TTL_SIN_DATOS = 6 * 60 * 60
+
+# Caché por id de los repositorios de catálogo (repositorios/cache_por_id.py)
+# - CAPACIDAD: entidades guardadas por repositorio.
+# - TTL: segundos que vive una entrada. Los cambios hechos por este proceso
+#   invalidan el caché al instante; el TTL acota cuánto tarda en verse un
+#   cambio hecho por otro proceso sobre la misma BD.
+REPOSITORIOS_CACHE_CAPACIDAD = 1024
+REPOSITORIOS_CACHE_TTL = 5 * 60
+
+# Caché de credenciales por nombre de usuario (repositorios/usuario_repo.py)
+# Los cambios hechos por este proceso lo invalidan al instante; el TTL
+# acota cuánto puede seguir valiendo una contraseña o rol cambiados por
+# otro proceso.
+USUARIOS_CACHE_CAPACIDAD = 10_000
+USUARIOS_CACHE_TTL = 60
+
+# Catálogo público de planes (servicios/catalogo_service.py)
+# Cada cuántos segundos, como máximo, se revisa catalogo_versiones para
+# ver si cambió alguna empresa o plan (0 = en cada consulta).
+CATALOGO_INTERVALO_REVISION = 1.0
+
+# Precarga de indicadores (servicios/precarga_indicadores.py)
+# - PRECARGA: indicadores que se piden cada mañana para hoy.
+# - DIAS_ADELANTE: días futuros que se intentan traer por indicador (la UF
+#   se publica con anticipación); las fechas aún no publicadas se omiten.
+# - HORA_PRECARGA: hora local ("HH:MM") de la precarga diaria.
+# - DIAS_CALENTAR: días hacia atrás que se cargan desde la BD al caché
+#   al iniciar el programa.
+INDICADORES_PRECARGA = ["UF", "DOLAR", "UTM", "EURO"]
+INDICADORES_DIAS_ADELANTE = {"UF": 31}
+INDICADORES_HORA_PRECARGA = "07:00"
+INDICADORES_DIAS_CALENTAR = 7
+
+# Registro de consultas de indicadores (repositorios/escritor_consultas.py)
+# Las consultas se acumulan en memoria y se escriben en lotes:
+# - TAMANO_LOTE: se escribe al juntar esta cantidad...
+# - INTERVALO: ...o cada tantos segundos, lo que ocurra primero.
+# - CAPACIDAD: máximo de consultas pendientes en memoria. Si se llena,
+#   registrar() espera hasta TIMEOUT_ENCOLAR segundos y luego falla.
+AUDITORIA_TAMANO_LOTE = 500
+AUDITORIA_INTERVALO = 1.0
+AUDITORIA_CAPACIDAD = 10000
+AUDITORIA_TIMEOUT_ENCOLAR = 5.0
+
+# Retención de consultas de indicadores (servicios/retencion_consultas.py)
+# - DIAS_RETENCION: las consultas más antiguas se resumen por día y se borran.
+# - TAMANO_LOTE: filas borradas por transacción (transacciones cortas para
+#   no retener el lock de escritura).
+# - PAUSA: segundos entre lotes, para dejar pasar a otros escritores.
+# - PAGINAS_VACUUM: páginas libres devueltas al disco por ejecución
+#   (None = todas).
+RETENCION_DIAS = 90
+RETENCION_TAMANO_LOTE = 5000
+RETENCION_PAUSA = 0.05
+RETENCION_PAGINAS_VACUUM = None
+
+# Pool de conexiones SQLite (db.connection.DatabaseConnection)
+# - DB_POOL_SIZE: máximo de conexiones abiertas a la vez (0 = sin pool,
+#   se abre y cierra una conexión por operación como antes).
+# - DB_POOL_TIMEOUT: segundos que se espera por una conexión libre.
+DB_POOL_SIZE = 8
+DB_POOL_TIMEOUT = 10.0
+
+# Perfiles de PRAGMA que se aplican a cada conexión nueva, en este orden.
+# - "seguro": modo rollback-journal clásico, máxima durabilidad.
+# - "rendimiento": WAL, lectores y escritores no se bloquean entre sí.
+DB_PRAGMA_PERFILES = {
+    "seguro": {
+        "busy_timeout": 5000,        # ms esperando un lock antes de fallar
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+    },
+    "rendimiento": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",     # seguro en WAL, evita un fsync por commit
+        "cache_size": -20000,        # negativo = KiB (~20 MB por conexión)
+        "mmap_size": 268435456,      # 256 MB
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 1000,  # páginas
+    },
+}
+DB_PRAGMA_PERFIL = "rendimiento"
+
+# Cada cuántos segundos se hace un checkpoint PASSIVE del WAL en segundo
+# plano (0 = solo el autocheckpoint de SQLite y db.checkpoint() manual).
+DB_CHECKPOINT_INTERVALO = 0
+
+# Hash de contraseñas (servicios/hashing.py)
+# - ALGORITMO: "pbkdf2_sha256" o "scrypt". Los hashes guardados con otro
+#   algoritmo o con otros parámetros se siguen aceptando y se vuelven a
+#   hashear con estos al iniciar sesión.
+# - Para elegir el costo: python -m benchmarks.hashing_contrasenas
+#   (logins por segundo por núcleo con cada configuración).
+CONTRASENAS_ALGORITMO = "pbkdf2_sha256"
+CONTRASENAS_PBKDF2_ITERACIONES = 600_000
+CONTRASENAS_SCRYPT_N = 2**14        # costo de CPU y memoria (potencia de 2)
+CONTRASENAS_SCRYPT_R = 8            # memoria usada: 128 * N * R bytes (16 MB)
+CONTRASENAS_SCRYPT_P = 1
+CONTRASENAS_LARGO_SAL = 16          # bytes
+
+# Dónde se calculan los hashes (servicios/ejecutor_hashing.py)
+# - MODO: "hilos" (hashlib libera el GIL: escala con los núcleos sin copiar
+#   datos entre procesos), "procesos" o None (en el hilo que llama).
+# - WORKERS: hashes simultáneos (None = un worker por núcleo).
+# - COLA: solicitudes que pueden esperar además de las que se ejecutan; si
+#   se llena, las siguientes esperan hasta TIMEOUT y fallan con TimeoutError.
+# - TIMEOUT: segundos máximos por solicitud, incluyendo la espera en la cola.
+CONTRASENAS_EJECUTOR_MODO = "hilos"
+CONTRASENAS_EJECUTOR_WORKERS = None
+CONTRASENAS_EJECUTOR_COLA = 64
+CONTRASENAS_EJECUTOR_TIMEOUT = 5.0
+
+# Límite de intentos de login (servicios/limite_login.py)
+# Token bucket: (capacidad, fichas por segundo). Cada intento gasta una
+# ficha; sin fichas se rechaza antes de leer la BD o calcular el hash.
+# - USUARIO: por nombre de usuario (5 seguidos, luego 1 por minuto). Un
+#   login correcto rellena el balde del usuario.
+# - ORIGEN: por origen de la solicitud (IP, terminal, ...), si se conoce.
+# - MAX_CLAVES: baldes en memoria por limitador.
+# - PERSISTIR: guardar los baldes en la tabla limites_login al salir y
+#   restaurarlos al iniciar, para que reiniciar no borre los límites.
+LOGIN_LIMITE_USUARIO = (5, 1 / 60)
+LOGIN_LIMITE_ORIGEN = (20, 1 / 6)
+LOGIN_LIMITE_MAX_CLAVES = 100_000
+LOGIN_LIMITE_PERSISTIR = False
+
+# Tokens de sesión (servicios/sesiones.py)
+# - CLAVE: secreto con que se firman los tokens (HMAC-SHA256). Se lee de la
+#   variable de entorno ISPPLUS_CLAVE_SESIONES; si no está, cada proceso
+#   genera una clave al azar y los tokens dejan de valer al reiniciarlo.
+# - DURACION: segundos que vale un token desde que se emite.
+SESIONES_CLAVE = os.environ.get("ISPPLUS_CLAVE_SESIONES")
+SESIONES_DURACION = 8 * 60 * 60
+
 # Nombre de la aplicación (por si lo quieres mostrar en menús/títulos)
 APP_NAME = "ISPPlus Backend"
 
@@ -1,33 +1,351 @@
 # db/connection.py
+import atexit
+import queue
 import sqlite3
+import threading
+from collections.abc import Callable
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
-# Si ya tienes config.py con DB_PATH, puedes importar desde ahí:
-# from config import DB_PATH
-# Para que sea autocontenido, lo dejo definido aquí:
-BASE_DIR = Path(__file__).resolve().parent.parent
-DB_PATH = BASE_DIR / "ispplus.db"
+from config import (
+    DB_CHECKPOINT_INTERVALO,
+    DB_PATH,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_PRAGMA_PERFIL,
+    DB_PRAGMA_PERFILES,
+)
+
+MODOS_CHECKPOINT = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
 
 
 class DatabaseConnection:
-    def __init__(self, db_path: str | Path = DB_PATH):
+    """
+    Entrega conexiones SQLite a los repositorios.
+
+    Modos de uso:
+    - pool_size = 0: se abre y se cierra una conexión por cada operación.
+    - pool_size > 0: las conexiones se reutilizan desde un pool de tamaño
+      máximo 'pool_size'. Antes de entregar una conexión se verifica que siga
+      sana; si no, se descarta y se abre otra.
+
+    En ambos modos, si un mismo hilo pide una conexión mientras ya tiene una
+    en uso (llamadas anidadas), se le entrega la misma conexión y solo el
+    nivel más externo hace commit/rollback.
+
+    Cada conexión nueva recibe los PRAGMA del perfil elegido en config.py
+    (DB_PRAGMA_PERFIL), o los que se pasen en 'pragmas'.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = DB_PATH,
+        pool_size: int = DB_POOL_SIZE,
+        pool_timeout: float = DB_POOL_TIMEOUT,
+        pragmas: dict[str, str | int] | None = None,
+    ):
         self.db_path = str(db_path)
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.pragmas = dict(
+            DB_PRAGMA_PERFILES[DB_PRAGMA_PERFIL] if pragmas is None else pragmas
+        )
+        for nombre in self.pragmas:
+            if not nombre.isidentifier():
+                raise ValueError(f"Nombre de PRAGMA inválido: {nombre!r}")
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # LIFO: la conexión usada más recientemente es la primera en reutilizarse
+        self._libres: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._abiertas = 0
+        self._cerrado = False
+
+        self._hilo_checkpoint: threading.Thread | None = None
+        self._detener_checkpoint = threading.Event()
+
+    # ---------- Ciclo de vida de conexiones ----------
+
+    def _abrir(self) -> sqlite3.Connection:
+        # check_same_thread=False: una conexión del pool puede ser usada por
+        # distintos hilos, aunque nunca por dos a la vez.
+        conn = sqlite3.connect(self.db_path, check_same_thread=self.pool_size <= 0)
+        # Activar soporte de claves foráneas en SQLite
+        conn.execute("PRAGMA foreign_keys = ON;")
+        for nombre, valor in self.pragmas.items():
+            conn.execute(f"PRAGMA {nombre} = {valor};")
+        return conn
+
+    def _esta_sana(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _descartar(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._abiertas -= 1
+
+    def _adquirir(self) -> sqlite3.Connection:
+        if self._cerrado:
+            raise RuntimeError("El pool de conexiones está cerrado")
+
+        if self.pool_size <= 0:
+            return self._abrir()
+
+        while True:
+            try:
+                conn = self._libres.get_nowait()
+            except queue.Empty:
+                conn = None
+
+            if conn is None:
+                with self._lock:
+                    puede_abrir = self._abiertas < self.pool_size
+                    if puede_abrir:
+                        self._abiertas += 1
+                if puede_abrir:
+                    try:
+                        return self._abrir()
+                    except Exception:
+                        with self._lock:
+                            self._abiertas -= 1
+                        raise
+                try:
+                    conn = self._libres.get(timeout=self.pool_timeout)
+                except queue.Empty:
+                    raise TimeoutError(
+                        f"No hay conexiones libres en el pool tras {self.pool_timeout} s"
+                    ) from None
+
+            if self._esta_sana(conn):
+                return conn
+            self._descartar(conn)
+
+    def _liberar(self, conn: sqlite3.Connection) -> None:
+        if self.pool_size <= 0:
+            conn.close()
+            return
+
+        if self._cerrado or conn.in_transaction:
+            # Una conexión con una transacción a medias no vuelve al pool
+            self._descartar(conn)
+            return
+
+        self._libres.put(conn)
+
+    # ---------- API pública ----------
 
     @contextmanager
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        actual = getattr(self._local, "conn", None)
+        if actual is not None:
+            # Llamada anidada en el mismo hilo: se reutiliza la conexión y el
+            # commit/rollback queda a cargo del nivel externo.
+            yield actual
+            return
+
+        conn = self._adquirir()
+        self._local.conn = conn
+        pendientes = self._local.al_confirmar = []
         try:
-            # Activar soporte de claves foráneas en SQLite
-            conn.execute("PRAGMA foreign_keys = ON;")
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
         finally:
-            conn.close()
+            self._local.conn = None
+            self._local.al_confirmar = None
+            self._liberar(conn)
+
+        for funcion, args in pendientes:
+            funcion(*args)
+
+    def al_confirmar(self, funcion: Callable[..., Any], *args) -> None:
+        """
+        Ejecuta funcion(*args) cuando se confirme (commit) la transacción en
+        curso de este hilo; si hay rollback no se ejecuta. Sin una conexión
+        abierta en este hilo se ejecuta de inmediato.
+
+        Sirve para invalidar cachés recién cuando el cambio es visible para
+        las demás conexiones.
+        """
+        pendientes = getattr(self._local, "al_confirmar", None)
+        if pendientes is None:
+            funcion(*args)
+        else:
+            pendientes.append((funcion, args))
+
+    @contextmanager
+    def usando(self, conn: sqlite3.Connection):
+        """
+        Dentro del bloque, las operaciones de repositorio de este hilo usan
+        'conn' como una conexión anidada: sin commit ni rollback automáticos
+        y sin ejecutar los al_confirmar(). Un db.transaccion() dentro del
+        bloque se une a la transacción de quien llama. Sirve para correr los
+        repositorios sobre otra BD, por ejemplo una en memoria
+        (db/verificar_planes.py).
+        """
+        anterior = (getattr(self._local, "conn", None),
+                    getattr(self._local, "al_confirmar", None),
+                    getattr(self._local, "transaccion", False))
+        self._local.conn = conn
+        self._local.al_confirmar = []
+        self._local.transaccion = True
+        try:
+            yield conn
+        finally:
+            self._local.conn, self._local.al_confirmar, self._local.transaccion = anterior
+
+    def en_transaccion(self) -> bool:
+        """
+        True si este hilo tiene una transacción abierta (con cambios que las
+        demás conexiones todavía no ven).
+        """
+        conn = getattr(self._local, "conn", None)
+        return conn is not None and conn.in_transaction
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Unidad de trabajo: todas las operaciones de repositorio hechas dentro
+        del bloque usan la misma conexión y una sola transacción BEGIN IMMEDIATE.
+
+            with db.transaccion():
+                contrato = repo_contrato.obtener_por_id(contrato_id)
+                contrato.estado = "terminado"
+                repo_contrato.actualizar(contrato)
+
+        IMMEDIATE toma el lock de escritura al comenzar, así dos bloques
+        concurrentes no pueden leer el mismo estado y luego escribir ambos.
+        Si el bloque lanza una excepción se hace rollback de todo.
+
+        Un bloque anidado en otro db.transaccion() se une a la transacción
+        del nivel externo. Dentro de un get_connection() también se abre con
+        BEGIN IMMEDIATE (el commit queda a cargo del get_connection()); si
+        ahí ya hay una transacción implícita abierta, ya no se puede tomar
+        el lock antes de leer y se lanza RuntimeError.
+        """
+        actual = getattr(self._local, "conn", None)
+        if actual is not None and getattr(self._local, "transaccion", False):
+            yield actual
+            return
+
+        if actual is not None and actual.in_transaction:
+            raise RuntimeError(
+                "db.transaccion() dentro de un get_connection() con cambios sin "
+                "confirmar: abra la transacción antes de esas operaciones"
+            )
+
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE;")
+            self._local.transaccion = True
+            try:
+                yield conn
+            except Exception:
+                # Dentro de un get_connection() externo no se deshace nada
+                # de lo confirmado antes de este bloque.
+                conn.rollback()
+                raise
+            finally:
+                self._local.transaccion = False
+
+    def checkpoint(self, modo: str = "PASSIVE") -> tuple[int, int, int]:
+        """
+        Ejecuta un checkpoint del WAL y retorna (busy, paginas_wal, paginas_copiadas).
+
+        - PASSIVE: copia lo que pueda sin esperar a lectores ni escritores.
+        - FULL / RESTART: espera a los escritores para copiar todo el WAL.
+        - TRUNCATE: como RESTART y además deja el archivo -wal en 0 bytes.
+        """
+        modo = modo.upper()
+        if modo not in MODOS_CHECKPOINT:
+            raise ValueError(f"Modo de checkpoint inválido: {modo}")
+
+        with self.get_connection() as conn:
+            fila = conn.execute(f"PRAGMA wal_checkpoint({modo});").fetchone()
+        return tuple(fila)
+
+    def iniciar_checkpoints(self, intervalo: float, modo: str = "PASSIVE") -> None:
+        """
+        Lanza un hilo de fondo que hace checkpoint cada 'intervalo' segundos.
+        """
+        if self._hilo_checkpoint is not None and self._hilo_checkpoint.is_alive():
+            return
+
+        def _bucle():
+            while not self._detener_checkpoint.wait(intervalo):
+                try:
+                    self.checkpoint(modo)
+                except (sqlite3.Error, TimeoutError, RuntimeError):
+                    # Un checkpoint fallido se reintenta en la siguiente vuelta
+                    pass
+
+        self._detener_checkpoint.clear()
+        self._hilo_checkpoint = threading.Thread(
+            target=_bucle, name="sqlite-checkpoint", daemon=True
+        )
+        self._hilo_checkpoint.start()
+
+    def detener_checkpoints(self) -> None:
+        self._detener_checkpoint.set()
+        if self._hilo_checkpoint is not None:
+            self._hilo_checkpoint.join()
+            self._hilo_checkpoint = None
+
+    def vacuum_incremental(self, paginas: int | None = None) -> int:
+        """
+        Devuelve al sistema de archivos hasta 'paginas' páginas libres (todas
+        si es None). Solo funciona con auto_vacuum = INCREMENTAL.
+        Retorna cuántas páginas se liberaron.
+        """
+        with self.get_connection() as conn:
+            if conn.in_transaction:
+                raise RuntimeError("vacuum_incremental no se puede usar dentro de una transacción")
+            antes = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+            # executescript avanza el PRAGMA hasta el final; execute() libera
+            # una sola página por llamada.
+            conn.executescript(f"PRAGMA incremental_vacuum({int(paginas or 0)});")
+            despues = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+        return antes - despues
+
+    def habilitar_vacuum_incremental(self) -> bool:
+        """
+        Activa auto_vacuum = INCREMENTAL en una base de datos existente.
+        Requiere un VACUUM completo (reescribe el archivo y bloquea la BD
+        mientras dura), así que se hace una sola vez y a mano.
+        Retorna False si ya estaba activado.
+        """
+        with self.get_connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum;").fetchone()[0] == 2:
+                return False
+            conn.executescript("PRAGMA auto_vacuum = INCREMENTAL; VACUUM;")
+        return True
+
+    def cerrar(self) -> None:
+        """
+        Cierra todas las conexiones libres del pool. Las que estén en uso se
+        cierran al ser devueltas. Después de cerrar no se entregan más conexiones.
+        """
+        self.detener_checkpoints()
+        self._cerrado = True
+        while True:
+            try:
+                conn = self._libres.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(conn)
 
 
 # Instancia global que usarán todos los repositorios
 db = DatabaseConnection()
+if DB_CHECKPOINT_INTERVALO > 0:
+    db.iniciar_checkpoints(DB_CHECKPOINT_INTERVALO)
+atexit.register(db.cerrar)
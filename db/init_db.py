@@ -1,16 +1,19 @@
 # db/init_db.py
 
 """
-Inicializa la base de datos SQLite ejecutando el archivo schema.sql.
+Inicializa la base de datos SQLite.
 
 - Abre la base de datos ispplus.db en la raíz del proyecto.
-- Lee el script SQL (schema.sql).
-- Crea las tablas si no existen.
+- Si es nueva, crea las tablas con schema.sql.
+- Aplica las migraciones pendientes de db/migraciones/ (ver db/migrador.py).
+
+Cuando el esquema ya está al día solo se lee PRAGMA user_version.
 """
 
-import sqlite3
 from pathlib import Path
 
+from db.migrador import migrar
+
 # Directorio base del proyecto: carpeta padre de /db
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -20,14 +23,14 @@ DB_PATH = BASE_DIR / "ispplus.db"
 
 def init_db():
     """
-    Ejecuta el script schema.sql para crear todas las tablas necesarias.
+    Deja la base de datos en la última versión del esquema.
     """
-    schema_path = Path(__file__).resolve().parent / "schema.sql"
+    aplicadas = migrar(DB_PATH)
 
-    with sqlite3.connect(DB_PATH) as conn:
-        with open(schema_path, "r", encoding="utf-8") as f:
-            script = f.read()
-            conn.executescript(script)
-        conn.commit()
+    if not aplicadas:
+        print(f"Base de datos al día: {DB_PATH}")
+        return
 
     print(f"Base de datos inicializada en: {DB_PATH}")
+    for m in aplicadas:
+        print(f"  - versión {m.version} ({m.nombre}): {m.segundos * 1000:.1f} ms")
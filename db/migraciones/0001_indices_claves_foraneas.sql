@@ -0,0 +1,26 @@
+-- db/migraciones/0001_indices_claves_foraneas.sql
+--
+-- Índices para las columnas de clave foránea y de búsqueda.
+-- Sin ellos, listar_por_cliente / listar_por_empresa /
+-- listar_consultas_por_usuario recorren la tabla completa, y lo mismo hace
+-- SQLite al aplicar ON DELETE CASCADE desde clientes, usuarios e indicadores.
+
+CREATE INDEX IF NOT EXISTS idx_contratos_cliente_id
+    ON contratos (cliente_id);
+
+CREATE INDEX IF NOT EXISTS idx_contratos_plan_id
+    ON contratos (plan_id);
+
+-- Índice parcial: solo contiene los contratos activos de cada cliente
+CREATE INDEX IF NOT EXISTS idx_contratos_activos
+    ON contratos (cliente_id)
+    WHERE estado = 'activo';
+
+CREATE INDEX IF NOT EXISTS idx_planes_empresa_id
+    ON planes (empresa_id);
+
+CREATE INDEX IF NOT EXISTS idx_consultas_usuario_id
+    ON consultas_indicadores (usuario_id);
+
+CREATE INDEX IF NOT EXISTS idx_consultas_indicador_id
+    ON consultas_indicadores (indicador_id);
@@ -0,0 +1,15 @@
+-- db/migraciones/0002_contrato_activo_unico.sql
+--
+-- Regla de negocio "un solo contrato activo por cliente" en la base de datos.
+-- El índice parcial único reemplaza a idx_contratos_activos: sirve igual para
+-- ContratoRepositorio.tiene_contrato_activo() y además impide que dos
+-- contrataciones concurrentes dejen al cliente con dos contratos activos.
+--
+-- Si la base ya tiene clientes con más de un contrato activo, esta migración
+-- falla (y no se aplica) hasta corregir esos datos.
+
+DROP INDEX IF EXISTS idx_contratos_activos;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_contratos_activo_unico
+    ON contratos (cliente_id)
+    WHERE estado = 'activo';
@@ -0,0 +1,27 @@
+-- db/migraciones/0003_resumen_consultas_diarias.sql
+--
+-- Resumen diario de consultas de indicadores. El job de retención
+-- (servicios/retencion_consultas.py) suma aquí las consultas antiguas
+-- y las borra de consultas_indicadores.
+
+CREATE TABLE IF NOT EXISTS consultas_indicadores_diarias (
+    usuario_id      INTEGER NOT NULL,
+    indicador_id    INTEGER NOT NULL,
+    dia             TEXT    NOT NULL,   -- 'YYYY-MM-DD'
+    cantidad        INTEGER NOT NULL,
+    PRIMARY KEY (usuario_id, indicador_id, dia),
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id)
+        ON UPDATE CASCADE
+        ON DELETE CASCADE,
+    FOREIGN KEY (indicador_id) REFERENCES indicadores(id)
+        ON UPDATE CASCADE
+        ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- usuario_id ya queda cubierto por la clave primaria
+CREATE INDEX IF NOT EXISTS idx_consultas_diarias_indicador_id
+    ON consultas_indicadores_diarias (indicador_id);
+
+-- Para encontrar por fecha las consultas a compactar
+CREATE INDEX IF NOT EXISTS idx_consultas_fecha_consulta
+    ON consultas_indicadores (fecha_consulta);
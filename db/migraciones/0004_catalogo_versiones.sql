@@ -0,0 +1,86 @@
+-- db/migraciones/0004_catalogo_versiones.sql
+--
+-- Registro de cambios del catálogo público (empresas y sus planes).
+-- Cada vez que cambia una empresa o uno de sus planes, los triggers le
+-- asignan a esa empresa un número de cambio nuevo (el mayor + 1).
+-- servicios/catalogo_service.py reconstruye solo las empresas con un
+-- número mayor al último que procesó. Hay una fila por empresa.
+
+CREATE TABLE IF NOT EXISTS catalogo_versiones (
+    empresa_id  INTEGER PRIMARY KEY,    -- sin FK: debe sobrevivir al borrado de la empresa
+    cambio      INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_catalogo_versiones_cambio
+    ON catalogo_versiones (cambio);
+
+-- ---------- planes ----------
+
+CREATE TRIGGER IF NOT EXISTS trg_catalogo_plan_insertado
+AFTER INSERT ON planes
+BEGIN
+    INSERT INTO catalogo_versiones (empresa_id, cambio)
+    VALUES (NEW.empresa_id, (SELECT COALESCE(MAX(cambio), 0) + 1 FROM catalogo_versiones))
+    ON CONFLICT (empresa_id) DO UPDATE SET cambio = excluded.cambio;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_catalogo_plan_actualizado
+AFTER UPDATE ON planes
+BEGIN
+    INSERT INTO catalogo_versiones (empresa_id, cambio)
+    VALUES (NEW.empresa_id, (SELECT COALESCE(MAX(cambio), 0) + 1 FROM catalogo_versiones))
+    ON CONFLICT (empresa_id) DO UPDATE SET cambio = excluded.cambio;
+END;
+
+-- El plan pasó a otra empresa: la anterior también cambia
+CREATE TRIGGER IF NOT EXISTS trg_catalogo_plan_cambio_empresa
+AFTER UPDATE OF empresa_id ON planes
+WHEN OLD.empresa_id <> NEW.empresa_id
+BEGIN
+    INSERT INTO catalogo_versiones (empresa_id, cambio)
+    VALUES (OLD.empresa_id, (SELECT COALESCE(MAX(cambio), 0) + 1 FROM catalogo_versiones))
+    ON CONFLICT (empresa_id) DO UPDATE SET cambio = excluded.cambio;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_catalogo_plan_eliminado
+AFTER DELETE ON planes
+BEGIN
+    INSERT INTO catalogo_versiones (empresa_id, cambio)
+    VALUES (OLD.empresa_id, (SELECT COALESCE(MAX(cambio), 0) + 1 FROM catalogo_versiones))
+    ON CONFLICT (empresa_id) DO UPDATE SET cambio = excluded.cambio;
+END;
+
+-- ---------- empresas ----------
+
+CREATE TRIGGER IF NOT EXISTS trg_catalogo_empresa_insertada
+AFTER INSERT ON empresas
+BEGIN
+    INSERT INTO catalogo_versiones (empresa_id, cambio)
+    VALUES (NEW.id, (SELECT COALESCE(MAX(cambio), 0) + 1 FROM catalogo_versiones))
+    ON CONFLICT (empresa_id) DO UPDATE SET cambio = excluded.cambio;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_catalogo_empresa_actualizada
+AFTER UPDATE ON empresas
+BEGIN
+    INSERT INTO catalogo_versiones (empresa_id, cambio)
+    VALUES (NEW.id, (SELECT COALESCE(MAX(cambio), 0) + 1 FROM catalogo_versiones))
+    ON CONFLICT (empresa_id) DO UPDATE SET cambio = excluded.cambio;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_catalogo_empresa_cambio_id
+AFTER UPDATE OF id ON empresas
+WHEN OLD.id <> NEW.id
+BEGIN
+    INSERT INTO catalogo_versiones (empresa_id, cambio)
+    VALUES (OLD.id, (SELECT COALESCE(MAX(cambio), 0) + 1 FROM catalogo_versiones))
+    ON CONFLICT (empresa_id) DO UPDATE SET cambio = excluded.cambio;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_catalogo_empresa_eliminada
+AFTER DELETE ON empresas
+BEGIN
+    INSERT INTO catalogo_versiones (empresa_id, cambio)
+    VALUES (OLD.id, (SELECT COALESCE(MAX(cambio), 0) + 1 FROM catalogo_versiones))
+    ON CONFLICT (empresa_id) DO UPDATE SET cambio = excluded.cambio;
+END;
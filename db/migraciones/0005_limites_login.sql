@@ -0,0 +1,10 @@
+-- db/migraciones/0005_limites_login.sql
+--
+-- Estado de los limitadores de intentos de login (servicios/limite_login.py)
+-- para conservarlo entre reinicios, si LOGIN_LIMITE_PERSISTIR está activo.
+
+CREATE TABLE IF NOT EXISTS limites_login (
+    clave           TEXT    PRIMARY KEY,    -- 'usuario:<nombre>' u 'origen:<origen>'
+    fichas          REAL    NOT NULL,
+    actualizado     REAL    NOT NULL        -- segundos desde epoch (time.time())
+) WITHOUT ROWID;
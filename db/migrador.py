@@ -0,0 +1,138 @@
+# db/migrador.py
+
+"""
+Migraciones versionadas de la base de datos.
+
+La versión del esquema se guarda en PRAGMA user_version:
+- 0: base de datos nueva o creada antes de existir las migraciones. Se
+  aplica primero schema.sql (es idempotente: usa CREATE TABLE IF NOT EXISTS).
+- N: ya se aplicó la migración db/migraciones/NNNN_*.sql con número N.
+
+Si la versión ya es la última, migrar() solo lee PRAGMA user_version.
+Cada migración se aplica en su propia transacción junto con el cambio de
+user_version: o se aplica completa o no se aplica.
+"""
+
+import sqlite3
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from config import DB_PATH
+
+SCHEMA_PATH = Path(__file__).resolve().parent / "schema.sql"
+
+# Cada migración es un archivo 'NNNN_descripcion.sql'. El número NNNN es la
+# versión que queda guardada en PRAGMA user_version al aplicarla.
+MIGRACIONES_DIR = Path(__file__).resolve().parent / "migraciones"
+
+
+@dataclass
+class MigracionAplicada:
+    version: int
+    nombre: str
+    segundos: float
+
+
+def listar_migraciones() -> list[tuple[int, Path]]:
+    """
+    Retorna las migraciones disponibles como (version, ruta), ordenadas.
+    """
+    migraciones = []
+    for ruta in MIGRACIONES_DIR.glob("*.sql"):
+        numero = ruta.name.split("_", 1)[0]
+        if numero.isdigit():
+            migraciones.append((int(numero), ruta))
+    return sorted(migraciones)
+
+
+def version_actual(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+
+def _sentencias(script: str) -> Iterator[str]:
+    """
+    Separa el script en sentencias completas. sqlite3.complete_statement
+    evita cortar en los ';' de un trigger (BEGIN ... END) o de un comentario.
+    """
+    actual = ""
+    for parte in script.split(";"):
+        actual += parte + ";"
+        if sqlite3.complete_statement(actual):
+            yield actual
+            actual = ""
+    if actual.strip(" \t\n;"):
+        yield actual
+
+
+def _aplicar_script(conn: sqlite3.Connection, script: str, version: int) -> bool:
+    """
+    Ejecuta el script y fija user_version en una sola transacción.
+
+    La transacción toma el lock de escritura (BEGIN IMMEDIATE) antes de
+    volver a leer user_version: si otro proceso ya aplicó esta versión
+    mientras se esperaba el lock, no se hace nada y se retorna False.
+    No se usa executescript() porque hace COMMIT antes de empezar y
+    soltaría el lock.
+    """
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        actual = version_actual(conn)
+        # schema.sql (versión 0) solo se omite si ya hay migraciones encima
+        if actual > version or (version > 0 and actual == version):
+            conn.rollback()
+            return False
+        for sentencia in _sentencias(script):
+            conn.execute(sentencia)
+        conn.execute(f"PRAGMA user_version = {version};")
+        conn.commit()
+        return True
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+def aplicar_migraciones(conn: sqlite3.Connection) -> list[MigracionAplicada]:
+    """
+    Lleva la base de datos de 'conn' a la última versión.
+
+    Retorna las migraciones aplicadas con su duración (lista vacía si el
+    esquema ya estaba al día). Si dos procesos migran a la vez, cada
+    migración la aplica solo uno de ellos.
+    """
+    version = version_actual(conn)
+    pendientes = [(v, ruta) for v, ruta in listar_migraciones() if v > version]
+    if not pendientes and version > 0:
+        return []
+
+    aplicadas = []
+
+    if version == 0:
+        # Solo tiene efecto en una BD sin tablas y fuera de una transacción.
+        # Permite devolver espacio al disco con PRAGMA incremental_vacuum.
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        inicio = time.perf_counter()
+        if _aplicar_script(conn, SCHEMA_PATH.read_text(encoding="utf-8"), 0):
+            aplicadas.append(
+                MigracionAplicada(0, SCHEMA_PATH.name, time.perf_counter() - inicio)
+            )
+
+    for v, ruta in pendientes:
+        inicio = time.perf_counter()
+        if _aplicar_script(conn, ruta.read_text(encoding="utf-8"), v):
+            aplicadas.append(MigracionAplicada(v, ruta.name, time.perf_counter() - inicio))
+
+    return aplicadas
+
+
+def migrar(db_path: str | Path = DB_PATH) -> list[MigracionAplicada]:
+    """
+    Abre la base de datos en 'db_path' y aplica las migraciones pendientes.
+    """
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return aplicar_migraciones(conn)
+    finally:
+        conn.close()
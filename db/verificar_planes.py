@@ -0,0 +1,347 @@
+# db/verificar_planes.py
+
+"""
+Chequeo de planes de consulta.
+
+Crea una base de datos en memoria con schema.sql y todas las migraciones,
+le carga una fila de ejemplo por tabla y ejecuta sobre ella los métodos de
+los repositorios (llamadas_repositorios()). Las sentencias que realmente
+envían a SQLite se capturan con set_trace_callback y a cada una se le
+aplica EXPLAIN QUERY PLAN: falla si alguna recorre una tabla completa
+(SCAN) en vez de usar un índice. Así el chequeo sigue a los repositorios
+cuando cambian sus consultas.
+
+Además revisa:
+- iterar()/listar_pagina() de cada repositorio filtrando por cada columna
+  de _COLUMNAS. Un filtro sin índice recorre la tabla por id: solo se
+  acepta si la columna está en FILTROS_SIN_INDICE.
+- Las búsquedas que hace SQLite en las tablas hijas al aplicar ON DELETE /
+  ON UPDATE y al validar RESTRICT, según PRAGMA foreign_key_list.
+
+Uso:
+    python -m db.verificar_planes
+
+Termina con código 1 si alguna consulta hace un SCAN completo.
+Al agregar un método de consulta a un repositorio, agréguelo a
+llamadas_repositorios().
+Los listar() sin filtro recorren la tabla por diseño y no se incluyen; los
+demás métodos que leen una tabla completa a propósito van en RECORREN_TABLA.
+"""
+
+import sqlite3
+import sys
+from collections.abc import Callable
+from dataclasses import replace
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from db.connection import db
+from db.migrador import aplicar_migraciones
+from modelos.cliente import Cliente
+from modelos.contrato import ContratoPlan
+from modelos.empresa import Empresa
+from modelos.indicadores import ConsultaIndicador, IndicadorEconomico
+from modelos.plan import Plan
+from modelos.usuario import RolUsuario, Usuario
+from repositorios.base import BaseRepositorio
+from repositorios.catalogo_repo import CatalogoRepositorio
+from repositorios.cliente_repo import ClienteRepositorio
+from repositorios.contrato_repo import ContratoRepositorio
+from repositorios.empresa_repo import EmpresaRepositorio
+from repositorios.indicadores_repo import IndicadoresRepositorio
+from repositorios.limites_login_repo import LimitesLoginRepositorio
+from repositorios.plan_repo import PlanRepositorio
+from repositorios.usuario_repo import UsuarioRepositorio
+
+REPOSITORIOS_GENERICOS: list[type[BaseRepositorio]] = [
+    ClienteRepositorio,
+    ContratoRepositorio,
+    EmpresaRepositorio,
+    IndicadoresRepositorio,
+    PlanRepositorio,
+    UsuarioRepositorio,
+]
+
+# Métodos que leen la tabla completa por diseño: sus SCAN no son error
+RECORREN_TABLA = {
+    "CatalogoRepositorio.listar_empresas_con_planes (todas)",
+    "LimitesLoginRepositorio.listar",
+    "LimitesLoginRepositorio.reemplazar",
+}
+
+# (tabla, columna) que se pueden pasar como filtro a listar_pagina() sin
+# tener índice: la página recorre la tabla por id hasta juntar 'limite'.
+FILTROS_SIN_INDICE = {
+    ("clientes", "nombre"), ("clientes", "rut"),
+    ("clientes", "email"), ("clientes", "telefono"),
+    ("contratos", "fecha_inicio"), ("contratos", "fecha_fin"), ("contratos", "estado"),
+    ("empresas", "nombre"), ("empresas", "rut"), ("empresas", "email_contacto"),
+    ("indicadores", "fecha_valor"), ("indicadores", "valor"),
+    ("planes", "nombre"), ("planes", "bajada_mbps"), ("planes", "subida_mbps"),
+    ("planes", "contencion"), ("planes", "precio_clp"), ("planes", "descripcion"),
+    ("usuarios", "contrasena"), ("usuarios", "rol"),
+}
+
+
+def crear_bd_referencia() -> sqlite3.Connection:
+    """
+    Crea una BD en memoria con el esquema completo y las migraciones.
+    """
+    conn = sqlite3.connect(":memory:")
+    aplicar_migraciones(conn)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+def cargar_semilla() -> SimpleNamespace:
+    """
+    Inserta una fila por tabla con los repositorios (en la conexión que
+    tenga este hilo) y retorna las entidades creadas.
+    """
+    s = SimpleNamespace()
+    s.empresa = EmpresaRepositorio().crear(
+        Empresa(id=None, nombre="Empresa", rut="76.000.000-0", email_contacto=None)
+    )
+    s.plan = PlanRepositorio().crear(
+        Plan(id=None, empresa_id=s.empresa.id, nombre="Plan", bajada_mbps=100,
+             subida_mbps=10, contencion=1, precio_clp=10000, descripcion="")
+    )
+    s.cliente = ClienteRepositorio().crear(
+        Cliente(id=None, nombre="Cliente", rut="11.111.111-1", email=None, telefono=None)
+    )
+    s.contrato = ContratoRepositorio().crear(
+        ContratoPlan(id=None, cliente_id=s.cliente.id, plan_id=s.plan.id,
+                     fecha_inicio=date(2025, 1, 1), fecha_fin=None, estado="activo")
+    )
+    s.usuario = UsuarioRepositorio().crear(
+        Usuario(id=None, nombre_usuario="admin", contrasena="x", rol=RolUsuario.ADMIN)
+    )
+    s.indicador = IndicadoresRepositorio().crear(
+        IndicadorEconomico(id=None, nombre="UF", fecha_valor=date(2025, 1, 1), valor=1.0)
+    )
+    IndicadoresRepositorio().registrar_consulta(
+        ConsultaIndicador(id=None, indicador_id=s.indicador.id, usuario_id=s.usuario.id,
+                          fecha_consulta=datetime(2025, 1, 1), fuente="bd")
+    )
+    return s
+
+
+def llamadas_repositorios(s: SimpleNamespace) -> dict[str, Callable[[], object]]:
+    """
+    Métodos de repositorio a revisar, en orden de ejecución (los borrados
+    van al final). 's' son las entidades de cargar_semilla().
+    """
+    clientes, contratos = ClienteRepositorio(), ContratoRepositorio()
+    empresas, planes = EmpresaRepositorio(), PlanRepositorio()
+    usuarios, indicadores = UsuarioRepositorio(), IndicadoresRepositorio()
+    catalogo, limites = CatalogoRepositorio(), LimitesLoginRepositorio()
+
+    return {
+        "ClienteRepositorio.obtener_por_id": lambda: clientes.obtener_por_id(s.cliente.id),
+        "ClienteRepositorio.actualizar": lambda: clientes.actualizar(s.cliente),
+        "EmpresaRepositorio.obtener_por_id": lambda: empresas.obtener_por_id(s.empresa.id),
+        "EmpresaRepositorio.actualizar": lambda: empresas.actualizar(s.empresa),
+        "PlanRepositorio.obtener_por_id": lambda: planes.obtener_por_id(s.plan.id),
+        "PlanRepositorio.listar_por_empresa": lambda: planes.listar_por_empresa(s.empresa.id),
+        "PlanRepositorio.actualizar": lambda: planes.actualizar(s.plan),
+        "PlanRepositorio.upsert_muchos": lambda: planes.upsert_muchos([s.plan]),
+        "ContratoRepositorio.obtener_por_id": lambda: contratos.obtener_por_id(s.contrato.id),
+        "ContratoRepositorio.listar_por_cliente":
+            lambda: contratos.listar_por_cliente(s.cliente.id),
+        "ContratoRepositorio.listar_contratos_detallados":
+            lambda: contratos.listar_contratos_detallados(s.cliente.id),
+        "ContratoRepositorio.listar_contratos_detallados_pagina":
+            lambda: contratos.listar_contratos_detallados_pagina(0, 100),
+        "ContratoRepositorio.listar_contratos_detallados_pagina (por estado)":
+            lambda: contratos.listar_contratos_detallados_pagina(0, 100, estado="activo"),
+        "ContratoRepositorio.tiene_contrato_activo":
+            lambda: contratos.tiene_contrato_activo(s.cliente.id),
+        "ContratoRepositorio.actualizar": lambda: contratos.actualizar(s.contrato),
+        "UsuarioRepositorio.obtener_por_id": lambda: usuarios.obtener_por_id(s.usuario.id),
+        "UsuarioRepositorio.obtener_por_nombre":
+            lambda: usuarios.obtener_por_nombre(s.usuario.nombre_usuario),
+        "UsuarioRepositorio.actualizar": lambda: usuarios.actualizar(s.usuario),
+        "UsuarioRepositorio.reemplazar_contrasena":
+            lambda: usuarios.reemplazar_contrasena(s.usuario.id, "x", "y"),
+        "UsuarioRepositorio.upsert_muchos": lambda: usuarios.upsert_muchos([s.usuario]),
+        "IndicadoresRepositorio.obtener_por_id":
+            lambda: indicadores.obtener_por_id(s.indicador.id),
+        "IndicadoresRepositorio.obtener_por_nombre_y_fecha":
+            lambda: indicadores.obtener_por_nombre_y_fecha("UF", date(2025, 1, 1)),
+        "IndicadoresRepositorio.listar_por_nombre_y_rango":
+            lambda: indicadores.listar_por_nombre_y_rango(
+                "UF", date(2025, 1, 1), date(2025, 12, 31)),
+        "IndicadoresRepositorio.upsert_muchos":
+            lambda: indicadores.upsert_muchos([replace(s.indicador, valor=2.0)]),
+        "IndicadoresRepositorio.actualizar": lambda: indicadores.actualizar(s.indicador),
+        "IndicadoresRepositorio.listar_consultas_por_usuario":
+            lambda: indicadores.listar_consultas_por_usuario(s.usuario.id),
+        "IndicadoresRepositorio.compactar_consultas_lote":
+            lambda: indicadores.compactar_consultas_lote(datetime(2026, 1, 1), 5000),
+        "IndicadoresRepositorio.listar_resumen_consultas_por_usuario":
+            lambda: indicadores.listar_resumen_consultas_por_usuario(s.usuario.id),
+        "CatalogoRepositorio.ultimo_cambio": catalogo.ultimo_cambio,
+        "CatalogoRepositorio.empresas_cambiadas": lambda: catalogo.empresas_cambiadas(0),
+        "CatalogoRepositorio.listar_empresas_con_planes (por empresa)":
+            lambda: catalogo.listar_empresas_con_planes([s.empresa.id]),
+        "CatalogoRepositorio.listar_empresas_con_planes (todas)":
+            catalogo.listar_empresas_con_planes,
+        "LimitesLoginRepositorio.reemplazar":
+            lambda: limites.reemplazar([("usuario:admin", 1.0, 0.0)]),
+        "LimitesLoginRepositorio.listar": limites.listar,
+        # Borrados al final: las cascadas vacían las tablas hijas
+        "ContratoRepositorio.eliminar": lambda: contratos.eliminar(s.contrato.id),
+        "PlanRepositorio.eliminar": lambda: planes.eliminar(s.plan.id),
+        "ClienteRepositorio.eliminar": lambda: clientes.eliminar(s.cliente.id),
+        "EmpresaRepositorio.eliminar": lambda: empresas.eliminar(s.empresa.id),
+        "UsuarioRepositorio.eliminar": lambda: usuarios.eliminar(s.usuario.id),
+        "IndicadoresRepositorio.eliminar": lambda: indicadores.eliminar(s.indicador.id),
+    }
+
+
+def llamadas_paginacion(conn: sqlite3.Connection) -> dict[str, Callable[[], object]]:
+    """
+    iterar() de cada repositorio genérico, filtrando por cada columna con
+    el valor que tiene en la fila de ejemplo.
+    """
+    llamadas = {}
+    for clase in REPOSITORIOS_GENERICOS:
+        repo = clase()
+        fila = conn.execute(
+            f"SELECT {', '.join(clase._COLUMNAS)} FROM {clase._TABLA} LIMIT 1"
+        ).fetchone()
+        for columna, valor in zip(clase._COLUMNAS, fila):
+            nombre = f"{clase.__name__}.iterar({columna}=...)"
+            llamadas[nombre] = (
+                lambda repo=repo, columna=columna, valor=valor:
+                list(repo.iterar(**{columna: valor}))
+            )
+    return llamadas
+
+
+def capturar_sentencias(conn: sqlite3.Connection,
+                        llamadas: dict[str, Callable[[], object]]) -> dict[str, list[str]]:
+    """
+    Ejecuta cada llamada usando 'conn' y retorna {nombre: sentencias SQL}
+    con los valores ya reemplazados en los parámetros.
+    """
+    capturadas: list[str] = []
+    conn.set_trace_callback(capturadas.append)
+    try:
+        resultado = {}
+        with db.usando(conn):
+            for nombre, llamada in llamadas.items():
+                capturadas.clear()
+                llamada()
+                # Con triggers o cascadas la misma sentencia se informa más de una vez
+                resultado[nombre] = list(dict.fromkeys(
+                    sql for sql in capturadas if _es_consulta(sql)
+                ))
+        return resultado
+    finally:
+        conn.set_trace_callback(None)
+
+
+def sentencias_claves_foraneas(conn: sqlite3.Connection) -> dict[str, list[str]]:
+    """
+    Búsquedas que hace SQLite sobre cada tabla hija al borrar o actualizar
+    la fila padre, según PRAGMA foreign_key_list.
+    """
+    tablas = [
+        fila[0] for fila in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )
+    ]
+    resultado = {}
+    for tabla in tablas:
+        for fk in conn.execute(f"PRAGMA foreign_key_list({tabla})"):
+            columna = fk[3]
+            resultado[f"FK {tabla}.{columna}"] = [
+                f"SELECT 1 FROM {tabla} WHERE {columna} = 1"
+            ]
+    return resultado
+
+
+def plan_de_consulta(conn: sqlite3.Connection, sql: str) -> list[str]:
+    """
+    Retorna las líneas de detalle de EXPLAIN QUERY PLAN para la sentencia.
+    """
+    filas = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [fila[3] for fila in filas]
+
+
+def _es_consulta(sql: str) -> bool:
+    # Se omiten BEGIN/COMMIT/PRAGMA y las líneas "-- TRIGGER ..." del trace
+    return sql.lstrip().split(None, 1)[0].upper() in ("SELECT", "INSERT", "UPDATE",
+                                                     "DELETE", "WITH", "REPLACE")
+
+
+def _es_scan_completo(linea: str) -> bool:
+    # "SCAN CONSTANT ROW" es el SELECT externo de un EXISTS(...) y
+    # "SCAN (subquery-N)" recorre el resultado de una subconsulta: no leen tablas
+    return (linea.startswith("SCAN ") and linea != "SCAN CONSTANT ROW"
+            and not linea.startswith("SCAN (subquery-"))
+
+
+def _usa_indice(plan: list[str]) -> bool:
+    return any(" USING INDEX " in linea or " USING COVERING INDEX " in linea
+               for linea in plan)
+
+
+def verificar_planes() -> tuple[dict[str, list[str]], int]:
+    """
+    Retorna ({"nombre: sql": lineas_del_plan} de las sentencias que hacen un
+    SCAN completo, cantidad de sentencias revisadas). Un diccionario vacío
+    significa que todas usan índices.
+    """
+    conn = crear_bd_referencia()
+    try:
+        with db.usando(conn):
+            semilla = cargar_semilla()
+        paginacion = llamadas_paginacion(conn)
+
+        sentencias = capturar_sentencias(conn, llamadas_repositorios(semilla))
+        sentencias_paginas = capturar_sentencias(conn, paginacion)
+        sentencias_fk = sentencias_claves_foraneas(conn)
+
+        fallidas, revisadas = {}, 0
+        for grupo in (sentencias, sentencias_paginas, sentencias_fk):
+            for nombre, lista in grupo.items():
+                for sql in lista:
+                    revisadas += 1
+                    plan = plan_de_consulta(conn, sql)
+                    if nombre in RECORREN_TABLA:
+                        continue
+                    if any(_es_scan_completo(linea) for linea in plan):
+                        fallidas[f"{nombre}: {' '.join(sql.split())}"] = plan
+                    elif grupo is sentencias_paginas and not _usa_indice(plan):
+                        clase, columna = _filtro_de(nombre)
+                        if (clase._TABLA, columna) not in FILTROS_SIN_INDICE:
+                            fallidas[f"{nombre}: {' '.join(sql.split())}"] = plan
+        return fallidas, revisadas
+    finally:
+        conn.close()
+
+
+def _filtro_de(nombre: str) -> tuple[type[BaseRepositorio], str]:
+    # "PlanRepositorio.iterar(nombre=...)" -> (PlanRepositorio, "nombre")
+    clase, _, resto = nombre.partition(".iterar(")
+    repos = {c.__name__: c for c in REPOSITORIOS_GENERICOS}
+    return repos[clase], resto.split("=", 1)[0]
+
+
+def main() -> int:
+    fallidas, revisadas = verificar_planes()
+    for nombre, plan in fallidas.items():
+        print(f"❌ {nombre}\n   {' | '.join(plan)}")
+
+    if fallidas:
+        print(f"{len(fallidas)} consulta(s) recorren la tabla completa.")
+        return 1
+
+    print(f"✅ {revisadas} consultas usan índices.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,24 +11,134 @@ Este módulo:
 El objetivo de este cliente es aislar toda la lógica de solicitudes HTTP.
 El repositorio NO debe hacer requests.
 El servicio de indicadores usa este cliente.
+
+Las solicitudes usan una requests.Session persistente: las conexiones TCP/TLS
+se reutilizan (keep-alive) y los errores transitorios se reintentan con
+espera exponencial. Para probar el cliente basta con apuntar 'base_url' a un
+servidor HTTP local que responda el mismo formato JSON.
 """
 
+import asyncio
 import requests
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from modelos.indicadores import IndicadorEconomico
-from config import API_INDICADORES_BASE_URL
+from config import (
+    API_INDICADORES_BASE_URL,
+    API_INDICADORES_BACKOFF,
+    API_INDICADORES_MAX_WORKERS,
+    API_INDICADORES_POOL,
+    API_INDICADORES_REINTENTOS,
+    API_INDICADORES_SOPORTA_RANGO,
+    API_INDICADORES_TIMEOUT,
+    API_INDICADORES_TIMEOUT_TOTAL,
+)
+
+# Códigos HTTP que se consideran transitorios y se reintentan
+ESTADOS_REINTENTABLES = (500, 502, 503, 504)
+
+# Códigos con los que la API indica que no tiene el endpoint de rangos.
+# Un 404 es ambiguo (también significa "sin datos") y se trata aparte.
+ESTADOS_SIN_RANGO = (405, 501)
+
+
+def _parsear_indicador(data: dict, nombre: str, fecha: date) -> IndicadorEconomico:
+    """
+    Convierte el JSON de la API en un IndicadorEconomico.
+
+    Según la API, el JSON puede ser distinto.
+    Aquí definimos un formato genérico esperado:
+    {
+        "nombre": "UF",
+        "fecha": "2025-01-10",
+        "valor": 36000.12
+    }
+    """
+    if "valor" not in data:
+        raise ValueError(f"La API no devolvió un valor válido para {nombre} en {fecha}")
+
+    return IndicadorEconomico(
+        id=None,
+        nombre=data["nombre"].upper(),
+        fecha_valor=date.fromisoformat(data["fecha"]),
+        valor=float(data["valor"])
+    )
+
+
+def _es_sin_datos(error: Exception) -> bool:
+    """
+    True si el error solo indica que no hay valor para esa fecha
+    (fin de semana, feriado, fecha aún no publicada): la API responde 404.
+
+    Un JSON inválido o con otro formato (ValueError) no es "sin datos":
+    se propaga para no descartar en silencio una respuesta rota.
+    """
+    return (isinstance(error, requests.HTTPError) and error.response is not None
+            and error.response.status_code == 404)
+
+
+def crear_sesion(reintentos: int = API_INDICADORES_REINTENTOS,
+                 backoff: float = API_INDICADORES_BACKOFF,
+                 tamano_pool: int = API_INDICADORES_POOL) -> requests.Session:
+    """
+    Crea una sesión HTTP con pool de conexiones keep-alive y reintentos.
+    """
+    politica = Retry(
+        total=reintentos,
+        backoff_factor=backoff,
+        status_forcelist=ESTADOS_REINTENTABLES,
+        allowed_methods=frozenset({"GET"}),
+        # Agotados los reintentos se retorna la última respuesta y
+        # raise_for_status() decide, igual que sin reintentos.
+        raise_on_status=False,
+    )
+    adaptador = HTTPAdapter(
+        pool_connections=tamano_pool,
+        pool_maxsize=tamano_pool,
+        max_retries=politica,
+    )
+
+    sesion = requests.Session()
+    sesion.mount("http://", adaptador)
+    sesion.mount("https://", adaptador)
+    sesion.headers.update({"Accept": "application/json"})
+    return sesion
 
 
 class IndicadoresClient:
     """
     Cliente para consumir la API de indicadores económicos.
 
-    Usa requests.get() para obtener datos desde un endpoint externo.
+    Usa una requests.Session compartida por todas las consultas del cliente.
     El formato exacto puede variar según la API usada.
     """
 
-    def __init__(self, base_url: str = API_INDICADORES_BASE_URL):
+    def __init__(self, base_url: str = API_INDICADORES_BASE_URL,
+                 sesion: requests.Session | None = None,
+                 timeout: float | tuple[float, float] = API_INDICADORES_TIMEOUT,
+                 soporta_rango: bool = API_INDICADORES_SOPORTA_RANGO,
+                 max_workers: int = API_INDICADORES_MAX_WORKERS):
         self.base_url = base_url.rstrip("/")
+        self.sesion = sesion or crear_sesion()
+        self.timeout = timeout
+        self.soporta_rango = soporta_rango
+        self.max_workers = max_workers
+        # True después de la primera respuesta correcta del endpoint de rangos
+        self._rango_confirmado = False
+
+    def cerrar(self) -> None:
+        """
+        Cierra las conexiones abiertas del pool de la sesión.
+        """
+        self.sesion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
 
     def obtener_indicador(self, nombre: str, fecha: date) -> IndicadorEconomico:
         """
@@ -43,6 +153,7 @@ class IndicadoresClient:
 
         Lanza:
         - requests.exceptions.RequestException si la API falla
+          (después de agotar los reintentos)
         - ValueError si la API no trae datos válidos
         """
 
@@ -50,25 +161,197 @@ class IndicadoresClient:
         url = f"{self.base_url}/{nombre.upper()}/{fecha.isoformat()}"
 
         # Hacer request HTTP
-        respuesta = requests.get(url, timeout=5)
+        respuesta = self.sesion.get(url, timeout=self.timeout)
         respuesta.raise_for_status()
 
-        data = respuesta.json()
+        return _parsear_indicador(respuesta.json(), nombre, fecha)
+
+    def _obtener_muchos(self, pares: list[tuple[str, date]]) -> list[IndicadorEconomico]:
+        """
+        Consulta varios (nombre, fecha) en paralelo, con a lo más
+        'max_workers' solicitudes simultáneas. Las fechas sin datos se omiten;
+        cualquier otro error se propaga.
+        """
+        def _consultar(par):
+            try:
+                return self.obtener_indicador(*par)
+            except Exception as e:
+                if _es_sin_datos(e):
+                    return None
+                raise
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            resultados = list(pool.map(_consultar, pares))
+        return [r for r in resultados if r is not None]
 
-        # Según la API, el JSON puede ser distinto.
-        # Aquí definimos un formato genérico esperado:
-        # {
-        #     "nombre": "UF",
-        #     "fecha": "2025-01-10",
-        #     "valor": 36000.12
-        # }
+    def _pedir_rango(self, nombre: str, desde: date,
+                     hasta: date) -> list[IndicadorEconomico] | None:
+        """
+        Consulta el endpoint /NOMBRE/desde/hasta. Retorna None si hay que
+        consultar fecha por fecha.
 
-        if "valor" not in data:
-            raise ValueError(f"La API no devolvió un valor válido para {nombre} en {fecha}")
+        Un 405/501 indica que la API no tiene el endpoint y no se vuelve a
+        usar. Un 404 puede ser "sin datos en el rango" o "no existe el
+        endpoint": si el endpoint ya respondió bien antes es lo primero;
+        si no, solo esta consulta se hace fecha por fecha.
+        """
+        if not self.soporta_rango:
+            return None
 
-        return IndicadorEconomico(
-            id=None,
-            nombre=data["nombre"].upper(),
-            fecha_valor=date.fromisoformat(data["fecha"]),
-            valor=float(data["valor"])
+        url = f"{self.base_url}/{nombre.upper()}/{desde.isoformat()}/{hasta.isoformat()}"
+        respuesta = self.sesion.get(url, timeout=self.timeout)
+        if respuesta.status_code in ESTADOS_SIN_RANGO:
+            self.soporta_rango = False
+            return None
+        if respuesta.status_code == 404:
+            return [] if self._rango_confirmado else None
+
+        respuesta.raise_for_status()
+        self._rango_confirmado = True
+        indicadores = [_parsear_indicador(data, nombre, desde) for data in respuesta.json()]
+        return sorted(indicadores, key=lambda i: i.fecha_valor)
+
+    def obtener_rango(self, nombre: str, desde: date, hasta: date) -> list[IndicadorEconomico]:
+        """
+        Retorna los valores del indicador entre 'desde' y 'hasta' (inclusive),
+        ordenados por fecha. Las fechas sin valor no aparecen.
+
+        Usa el endpoint /NOMBRE/desde/hasta en una sola solicitud; si la API
+        no lo tiene, consulta cada fecha en paralelo.
+        """
+        if hasta < desde:
+            raise ValueError("La fecha 'hasta' no puede ser anterior a 'desde'")
+
+        indicadores = self._pedir_rango(nombre, desde, hasta)
+        if indicadores is not None:
+            return indicadores
+
+        dias = (hasta - desde).days + 1
+        return self._obtener_muchos(
+            [(nombre, desde + timedelta(days=i)) for i in range(dias)]
         )
+
+    def obtener_varios(self, nombres: list[str], fecha: date) -> dict[str, IndicadorEconomico]:
+        """
+        Consulta varios indicadores para la misma fecha, en paralelo.
+        Retorna {NOMBRE: indicador}; los que no tienen valor no aparecen.
+        """
+        indicadores = self._obtener_muchos([(n, fecha) for n in nombres])
+        return {i.nombre: i for i in indicadores}
+
+
+class AsyncIndicadoresClient:
+    """
+    Variante asyncio de IndicadoresClient, con la misma API y el mismo
+    formato de respuesta.
+
+    requests es bloqueante y el proyecto no depende de una librería HTTP
+    asíncrona, así que cada solicitud corre en un pool de hilos propio (de
+    tamaño 'limite') usando la misma sesión con pool y reintentos del
+    cliente síncrono. El event loop queda libre mientras tanto, y una
+    consulta de muchos indicadores tarda lo que la más lenta, no la suma
+    de todas. Los rangos usan la misma estrategia que IndicadoresClient.
+
+    - 'limite': solicitudes simultáneas como máximo.
+    - 'timeout_total': segundos por consulta, incluyendo reintentos.
+    Si la tarea que espera se cancela, el resultado de la solicitud en
+    curso se descarta.
+    """
+
+    def __init__(self, base_url: str = API_INDICADORES_BASE_URL,
+                 sesion: requests.Session | None = None,
+                 timeout: float | tuple[float, float] = API_INDICADORES_TIMEOUT,
+                 limite: int = API_INDICADORES_MAX_WORKERS,
+                 timeout_total: float = API_INDICADORES_TIMEOUT_TOTAL,
+                 soporta_rango: bool = API_INDICADORES_SOPORTA_RANGO):
+        self._cliente = IndicadoresClient(base_url, sesion, timeout, soporta_rango)
+        self._semaforo = asyncio.Semaphore(limite)
+        # Pool propio: el executor por defecto de asyncio puede tener menos
+        # hilos que 'limite' y serializar las solicitudes.
+        self._hilos = ThreadPoolExecutor(max_workers=limite,
+                                         thread_name_prefix="indicadores-async")
+        self.timeout_total = timeout_total
+
+    @property
+    def base_url(self) -> str:
+        return self._cliente.base_url
+
+    async def cerrar(self, cerrar_sesion: bool = True) -> None:
+        """
+        Libera los hilos del cliente. Con cerrar_sesion=False la sesión HTTP
+        queda abierta (útil si se comparte con un IndicadoresClient).
+        """
+        self._hilos.shutdown(wait=False, cancel_futures=True)
+        if cerrar_sesion:
+            await asyncio.to_thread(self._cliente.cerrar)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cerrar()
+
+    async def _en_hilo(self, funcion, *args):
+        """
+        Ejecuta una solicitud bloqueante en el pool, respetando 'limite'
+        y 'timeout_total'.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._semaforo:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._hilos, funcion, *args),
+                self.timeout_total,
+            )
+
+    async def obtener_indicador(self, nombre: str, fecha: date) -> IndicadorEconomico:
+        """
+        Igual que IndicadoresClient.obtener_indicador. Además lanza
+        TimeoutError si la consulta supera 'timeout_total'.
+        """
+        return await self._en_hilo(self._cliente.obtener_indicador, nombre, fecha)
+
+    async def _obtener_o_nada(self, nombre: str, fecha: date) -> IndicadorEconomico | None:
+        try:
+            return await self.obtener_indicador(nombre, fecha)
+        except Exception as e:
+            if _es_sin_datos(e):
+                return None
+            raise
+
+    async def obtener_muchos(self, pares: list[tuple[str, date]]) -> list[IndicadorEconomico]:
+        """
+        Consulta todos los (nombre, fecha) concurrentemente. Las fechas sin
+        datos se omiten; ante cualquier otro error se cancelan las demás
+        consultas y se propaga el error.
+        """
+        tareas = [asyncio.ensure_future(self._obtener_o_nada(n, f)) for n, f in pares]
+        try:
+            resultados = await asyncio.gather(*tareas)
+        except BaseException:
+            for tarea in tareas:
+                tarea.cancel()
+            raise
+        return [r for r in resultados if r is not None]
+
+    async def obtener_rango(self, nombre: str, desde: date,
+                            hasta: date) -> list[IndicadorEconomico]:
+        """
+        Igual que IndicadoresClient.obtener_rango: una solicitud al endpoint
+        de rangos y, si la API no lo tiene, una por fecha en paralelo.
+        """
+        if hasta < desde:
+            raise ValueError("La fecha 'hasta' no puede ser anterior a 'desde'")
+
+        indicadores = await self._en_hilo(self._cliente._pedir_rango, nombre, desde, hasta)
+        if indicadores is not None:
+            return indicadores
+
+        dias = (hasta - desde).days + 1
+        return await self.obtener_muchos(
+            [(nombre, desde + timedelta(days=i)) for i in range(dias)]
+        )
+
+    async def obtener_varios(self, nombres: list[str],
+                             fecha: date) -> dict[str, IndicadorEconomico]:
+        indicadores = await self.obtener_muchos([(n, fecha) for n in nombres])
+        return {i.nombre: i for i in indicadores}
@@ -7,6 +7,7 @@ Por ahora implementa un menú de consola muy simple que permite:
 - Inicializar la base de datos.
 - Registrar usuarios.
 - Iniciar sesión.
+- Ver el catálogo público de planes.
 
 Más adelante puedes extender este menú para:
 - Gestionar empresas, clientes, planes y contratos.
@@ -16,8 +17,18 @@ Más adelante puedes extender este menú para:
 from getpass import getpass  # para escribir contraseñas sin mostrarlas
 from db.init_db import init_db
 from servicios.auth_service import AuthService
+from servicios.catalogo_service import catalogo_service
+from servicios.limite_login import DemasiadosIntentos, iniciar_persistencia
+from servicios.sesiones import SesionInvalida, servicio_sesiones
+from servicios.indicadores_service import IndicadoresService
 from modelos.usuario import RolUsuario
-from config import APP_NAME
+from config import (
+    APP_NAME,
+    INDICADORES_DIAS_ADELANTE,
+    INDICADORES_DIAS_CALENTAR,
+    INDICADORES_PRECARGA,
+    LOGIN_LIMITE_PERSISTIR,
+)
 
 
 def mostrar_banner():
@@ -30,25 +41,36 @@ def menu_principal() -> str:
     print("\nMenú principal")
     print("1) Registrar nuevo usuario")
     print("2) Iniciar sesión")
+    print("3) Ver catálogo de planes")
     print("0) Salir")
     return input("Elija una opción: ").strip()
 
 
-def menu_usuario_autenticado(usuario):
+def menu_usuario_autenticado(token: str):
     """
     Menú de ejemplo para cuando un usuario ya inició sesión.
+    Recibe el token de sesión: cada acción lo valida (sin volver a revisar
+    la contraseña) y puede autorizar según el rol que trae, por ejemplo
+    servicio_sesiones.exigir_rol(token, RolUsuario.ADMIN).
     Aquí más adelante puedes ramificar según rol:
     - cliente: ver su plan, contratar, etc.
     - empresa: gestionar sus planes.
     - admin: ver todo.
     """
-    print(f"\nBienvenido, {usuario.nombre_usuario} (rol: {usuario.rol})")
+    try:
+        sesion = servicio_sesiones.validar(token)
+    except SesionInvalida as e:
+        print(f"❌ {e}. Inicie sesión nuevamente.")
+        return
+
+    print(f"\nBienvenido, {sesion.nombre_usuario} (rol: {sesion.rol.value})")
     print("Este es un menú de ejemplo para usuario autenticado.")
     print("Aquí luego podrás:")
     print("- Gestionar planes")
     print("- Ver/crear contratos")
     print("- Consultar indicadores económicos")
-    input("Presione ENTER para volver al menú principal...")
+    input("Presione ENTER para cerrar sesión y volver al menú principal...")
+    servicio_sesiones.revocar(token)
 
 
 def registrar_usuario(auth_service: AuthService):
@@ -88,14 +110,43 @@ def iniciar_sesion(auth_service: AuthService):
     nombre_usuario = input("Nombre de usuario: ").strip()
     password = getpass("Contraseña: ")
 
-    usuario = auth_service.autenticar(nombre_usuario, password)
+    try:
+        usuario = auth_service.autenticar(nombre_usuario, password)
+    except DemasiadosIntentos as e:
+        print(f"❌ {e}")
+        return
+    except TimeoutError as e:
+        print(f"❌ No se pudo iniciar sesión: {e}. Intente de nuevo.")
+        return
+
     if not usuario:
         print("❌ Credenciales incorrectas.")
         return
 
-    # Si quieres, aquí podrías guardar el usuario en una variable global
-    # o pasarlo a otros menús según su rol.
-    menu_usuario_autenticado(usuario)
+    # Desde aquí los menús trabajan con el token, no con la contraseña
+    token = servicio_sesiones.emitir(usuario)
+    menu_usuario_autenticado(token)
+
+
+def mostrar_catalogo():
+    """
+    Vista pública: todas las empresas y sus planes.
+    """
+    print("\n=== Catálogo de planes ===")
+    catalogo = catalogo_service.obtener()
+    if not catalogo.empresas:
+        print("No hay empresas registradas.")
+        return
+
+    for empresa in catalogo.empresas:
+        print(f"\n{empresa.nombre}")
+        if not empresa.planes:
+            print("  (sin planes)")
+        for plan in empresa.planes:
+            print(
+                f"  - {plan.nombre}: {plan.bajada_mbps:g}/{plan.subida_mbps:g} Mbps, "
+                f"1:{plan.contencion}, ${plan.precio_clp:,} CLP"
+            )
 
 
 def main():
@@ -104,13 +155,23 @@ def main():
     """
     mostrar_banner()
 
-    # 1. Inicializar la base de datos (crear tablas si no existen)
+    # 1. Llevar la base de datos a la última versión del esquema
+    #    (si ya está al día, solo se lee PRAGMA user_version)
     init_db()
 
-    # 2. Crear instancia del servicio de autenticación
+    # 2. Cargar al caché los indicadores recientes ya guardados en la BD
+    IndicadoresService().calentar_cache(
+        INDICADORES_PRECARGA, INDICADORES_DIAS_CALENTAR, INDICADORES_DIAS_ADELANTE
+    )
+
+    # 3. Restaurar los límites de intentos de login guardados
+    if LOGIN_LIMITE_PERSISTIR:
+        iniciar_persistencia()
+
+    # 4. Crear instancia del servicio de autenticación
     auth_service = AuthService()
 
-    # 3. Bucle principal
+    # 5. Bucle principal
     while True:
         opcion = menu_principal()
 
@@ -118,6 +179,8 @@ def main():
             registrar_usuario(auth_service)
         elif opcion == "2":
             iniciar_sesion(auth_service)
+        elif opcion == "3":
+            mostrar_catalogo()
         elif opcion == "0":
             print("Saliendo del programa. ¡Hasta luego!")
             break
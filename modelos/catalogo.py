@@ -0,0 +1,39 @@
+# modelos/catalogo.py
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class PlanCatalogo:
+    """
+    Plan tal como se muestra en el catálogo público.
+    """
+    id: int
+    nombre: str
+    bajada_mbps: float
+    subida_mbps: float
+    contencion: int
+    precio_clp: int
+    descripcion: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class EmpresaCatalogo:
+    """
+    Empresa del catálogo público con sus planes, ordenados por precio.
+    """
+    id: int
+    nombre: str
+    email_contacto: str | None
+    planes: tuple[PlanCatalogo, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Catalogo:
+    """
+    Foto inmutable del catálogo: todas las empresas y sus planes.
+
+    'cambio' es el último número de catalogo_versiones incluido.
+    """
+    empresas: tuple[EmpresaCatalogo, ...]
+    cambio: int
@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Cliente:
     """
     Representa un cliente final del servicio ISP.
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import date
 
 
-@dataclass
+@dataclass(slots=True)
 class ContratoPlan:
     """
     Representa un contrato de un plan entre un cliente y una empresa.
@@ -23,3 +23,25 @@ class ContratoPlan:
     fecha_inicio: date
     fecha_fin: date | None
     estado: str
+
+
+@dataclass(frozen=True, slots=True)
+class ContratoDetalle:
+    """
+    Contrato junto con los datos del cliente, del plan y de la empresa,
+    leídos en una sola consulta. Es de solo lectura: para modificar un
+    contrato se usa ContratoPlan.
+    """
+    contrato_id: int
+    fecha_inicio: date
+    fecha_fin: date | None
+    estado: str
+    cliente_id: int
+    cliente_nombre: str
+    plan_id: int
+    plan_nombre: str
+    bajada_mbps: float
+    subida_mbps: float
+    precio_clp: int
+    empresa_id: int
+    empresa_nombre: str
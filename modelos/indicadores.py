@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import date, datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IndicadorEconomico:
     """
     Representa el valor de un indicador económico en una fecha dada.
@@ -14,6 +14,9 @@ class IndicadorEconomico:
         nombre          TEXT NOT NULL,   -- 'UF', 'DOLAR', 'UTM', etc.
         fecha_valor     TEXT NOT NULL,   -- 'YYYY-MM-DD'
         valor           REAL NOT NULL
+
+    Es inmutable (se comparte desde el caché entre hilos): para obtener una
+    copia con otro id se usa dataclasses.replace(indicador, id=...).
     """
     id: int | None
     nombre: str
@@ -21,7 +24,7 @@ class IndicadorEconomico:
     valor: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConsultaIndicador:
     """
     Representa el registro de una consulta de indicador hecha por un usuario.
@@ -32,6 +35,8 @@ class ConsultaIndicador:
         usuario_id      INTEGER NOT NULL,
         fecha_consulta  TEXT NOT NULL,   -- 'YYYY-MM-DDTHH:MM:SS'
         fuente          TEXT NOT NULL
+
+    Es inmutable, igual que IndicadorEconomico.
     """
     id: int | None
     indicador_id: int
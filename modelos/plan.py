@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Plan:
     """
     Representa un plan de internet ofrecido por una empresa.
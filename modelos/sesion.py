@@ -0,0 +1,20 @@
+# modelos/sesion.py
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from modelos.usuario import RolUsuario
+
+
+@dataclass(frozen=True, slots=True)
+class Sesion:
+    """
+    Datos de un token de sesión válido (servicios/sesiones.py).
+
+    No se guarda en la base de datos: todo viaja firmado dentro del token.
+    """
+    id: str                 # identificador aleatorio del token
+    usuario_id: int
+    nombre_usuario: str
+    rol: RolUsuario
+    expira: datetime
@@ -14,7 +14,7 @@ class RolUsuario(str, Enum):
     ADMIN = "admin"
 
 
-@dataclass
+@dataclass(slots=True)
 class Usuario:
     """
     Representa a un usuario del sistema.
@@ -1,13 +1,28 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from datetime import date
+from enum import Enum
 from typing import Generic, TypeVar
 
+from db.connection import db
+from repositorios.cache_por_id import invalidar_al_confirmar
+
 T = TypeVar('T')
 
 class BaseRepositorio(ABC, Generic[T]):
-    @abstractmethod
-    def agregar(self, entidad: T) -> None:
+    # Metadatos de la tabla para las operaciones genéricas (listar_pagina,
+    # iterar, crear_muchos, ...).
+    # Cada repositorio concreto los define:
+    # - _TABLA: nombre de la tabla.
+    # - _COLUMNAS: columnas sin 'id', en el mismo orden que _entidad_a_fila().
+    # - _CLAVE_UPSERT: columnas que identifican una fila en upsert_muchos().
+    _TABLA: str = ""
+    _COLUMNAS: tuple[str, ...] = ()
+    _CLAVE_UPSERT: tuple[str, ...] = ("id",)
+
+    def agregar(self, entidad: T) -> T:
         """Agrega una nueva entidad al repositorio."""
-        raise NotImplementedError
+        return self.crear(entidad)
 
     @abstractmethod
     def obtener_por_id(self, id: int) -> T:
@@ -24,7 +39,145 @@ class BaseRepositorio(ABC, Generic[T]):
         """Elimina una entidad del repositorio por su ID."""
         raise NotImplementedError
 
-    @abstractmethod
     def listar_todos(self) -> list[T]:
         """Lista todas las entidades en el repositorio."""
-        raise NotImplementedError
\ No newline at end of file
+        return self.listar()
+
+    # ---------- Conversión entre filas y entidades ----------
+
+    def _entidad_a_fila(self, entidad: T) -> tuple:
+        """Valores de la entidad para las columnas de _COLUMNAS."""
+        raise NotImplementedError
+
+    def _row_to_entity(self, row) -> T:
+        """Construye la entidad desde una fila (id, *_COLUMNAS)."""
+        raise NotImplementedError
+
+    # ---------- Paginación ----------
+
+    def _filtros_a_sql(self, filtros: dict) -> tuple[str, list]:
+        """
+        Traduce filtros de igualdad {columna: valor} a condiciones SQL.
+        Solo se aceptan columnas de _COLUMNAS.
+        """
+        condiciones, params = [], []
+        for columna, valor in filtros.items():
+            if columna not in self._COLUMNAS:
+                raise ValueError(f"No se puede filtrar {self._TABLA} por '{columna}'")
+            if valor is None:
+                condiciones.append(f"{columna} IS NULL")
+                continue
+            if isinstance(valor, Enum):
+                valor = valor.value
+            elif isinstance(valor, date):
+                valor = valor.isoformat()
+            condiciones.append(f"{columna} = ?")
+            params.append(valor)
+        return "".join(f" AND {c}" for c in condiciones), params
+
+    def listar_pagina(self, despues_de_id: int = 0, limite: int = 100,
+                      **filtros) -> list[T]:
+        """
+        Retorna hasta 'limite' entidades con id mayor a 'despues_de_id',
+        ordenadas por id. Para pedir la página siguiente se pasa el id de la
+        última entidad recibida (paginación por clave, sin OFFSET).
+
+        Los filtros opcionales son igualdades por columna, por ejemplo:
+            repo.listar_pagina(0, 500, estado="activo")
+        """
+        if limite <= 0:
+            raise ValueError("El límite de la página debe ser mayor a 0")
+
+        condiciones, params = self._filtros_a_sql(filtros)
+        columnas = ", ".join(("id",) + self._COLUMNAS)
+
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                SELECT {columnas}
+                FROM {self._TABLA}
+                WHERE id > ?{condiciones}
+                ORDER BY id
+                LIMIT ?
+                """,
+                (despues_de_id, *params, limite),
+            )
+            rows = cur.fetchall()
+
+        return [self._row_to_entity(r) for r in rows]
+
+    def iterar(self, tamano_lote: int = 1000, **filtros) -> Iterator[T]:
+        """
+        Recorre todas las entidades (con los mismos filtros que listar_pagina)
+        trayendo 'tamano_lote' filas por consulta, en memoria constante.
+
+        Cada lote se lee en su propia conexión: mientras el llamador procesa
+        las entidades no queda ninguna conexión ni transacción abierta.
+        """
+        ultimo_id = 0
+        while True:
+            lote = self.listar_pagina(ultimo_id, tamano_lote, **filtros)
+            yield from lote
+            if len(lote) < tamano_lote:
+                return
+            ultimo_id = lote[-1].id
+
+    # ---------- Operaciones masivas ----------
+
+    def crear_muchos(self, entidades: Iterable[T]) -> list[int]:
+        """
+        Inserta muchas entidades con executemany en una sola transacción.
+
+        'entidades' puede ser cualquier iterable (incluso un generador que lee
+        de un archivo): se consume fila a fila, sin armar una lista en memoria.
+        Retorna los ids asignados, en el mismo orden de entrada. Las entidades
+        no se modifican.
+        """
+        columnas = ", ".join(self._COLUMNAS)
+        marcadores = ", ".join("?" * len(self._COLUMNAS))
+        sql = f"INSERT INTO {self._TABLA} ({columnas}) VALUES ({marcadores})"
+
+        with db.get_connection() as conn:
+            cur = conn.executemany(sql, (self._entidad_a_fila(e) for e in entidades))
+            cantidad = cur.rowcount
+            if cantidad <= 0:
+                return []
+            ultimo_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        # Dentro de la transacción nadie más puede escribir en la tabla y los
+        # ids AUTOINCREMENT son correlativos, así que el bloque es contiguo.
+        return list(range(ultimo_id - cantidad + 1, ultimo_id + 1))
+
+    def upsert_muchos(self, entidades: Iterable[T]) -> list[int]:
+        """
+        Inserta o actualiza muchas entidades en una sola transacción.
+
+        Si ya existe una fila con la misma _CLAVE_UPSERT se actualizan sus
+        demás columnas. Retorna el id de cada fila, en el orden de entrada.
+
+        executemany() no puede devolver filas, así que aquí se ejecuta la misma
+        sentencia preparada (INSERT ... ON CONFLICT ... RETURNING id) por cada
+        entidad, dentro de la misma transacción.
+        """
+        por_id = self._CLAVE_UPSERT == ("id",)
+        columnas = ("id",) + self._COLUMNAS if por_id else self._COLUMNAS
+        actualizables = [c for c in columnas if c not in self._CLAVE_UPSERT]
+
+        sql = (
+            f"INSERT INTO {self._TABLA} ({', '.join(columnas)}) "
+            f"VALUES ({', '.join('?' * len(columnas))}) "
+            f"ON CONFLICT ({', '.join(self._CLAVE_UPSERT)}) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in actualizables)
+            + " RETURNING id"
+        )
+
+        ids = []
+        with db.get_connection() as conn:
+            for entidad in entidades:
+                fila = self._entidad_a_fila(entidad)
+                if por_id:
+                    fila = (entidad.id,) + fila
+                ids.append(conn.execute(sql, fila).fetchone()[0])
+                invalidar_al_confirmar(self._TABLA, ids[-1])
+        return ids
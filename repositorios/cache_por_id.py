@@ -0,0 +1,84 @@
+# repositorios/cache_por_id.py
+
+"""
+Caché opcional de obtener_por_id() para repositorios de datos que se leen
+mucho más de lo que se escriben (planes, empresas, clientes).
+
+Se activa creando una subclase con el mixin delante del repositorio:
+
+    class PlanRepositorioCacheado(CachePorIdMixin, PlanRepositorio):
+        _cache = CacheLRU(REPOSITORIOS_CACHE_CAPACIDAD, ttl=REPOSITORIOS_CACHE_TTL)
+
+- El caché es de la clase: lo comparten todas sus instancias.
+- Se entrega una copia de la entidad guardada, así el llamador puede
+  modificarla sin afectar a los demás.
+- Los cachés se registran por tabla (_TABLA). Los repositorios base
+  (PlanRepositorio, EmpresaRepositorio, ...) invalidan las entradas
+  afectadas al hacer commit de actualizar(), eliminar() y upsert_muchos(),
+  así un cambio hecho con el repositorio sin caché también se ve al instante.
+- Dentro de una transacción abierta no se usa el caché: se lee la BD, que
+  ya incluye los cambios propios aún no confirmados.
+"""
+
+import copy
+from collections.abc import Callable
+from typing import Any
+
+from db.connection import db
+from utilidades.cache import CacheLRU
+
+
+# Cachés por id registrados, por nombre de tabla
+_CACHES: dict[str, list[CacheLRU]] = {}
+
+
+def invalidar_al_confirmar(tabla: str, id: int) -> None:
+    """
+    Quita la entidad 'id' de los cachés de 'tabla' cuando la transacción en
+    curso haga commit. Si la tabla no tiene caché no hace nada.
+    """
+    for cache in _CACHES.get(tabla, ()):
+        db.al_confirmar(cache.invalidar, id)
+
+
+def invalidar_si_al_confirmar(tabla: str, predicado: Callable[[Any, Any], bool]) -> None:
+    """
+    Igual que invalidar_al_confirmar(), para las entradas (id, entidad)
+    que cumplen 'predicado' (por ejemplo, las borradas en cascada).
+    """
+    for cache in _CACHES.get(tabla, ()):
+        db.al_confirmar(cache.invalidar_si, predicado)
+
+
+class CachePorIdMixin:
+    _TABLA: str
+    _cache: CacheLRU
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_cache" in cls.__dict__:
+            _CACHES.setdefault(cls._TABLA, []).append(cls._cache)
+
+    def obtener_por_id(self, id: int):
+        if db.en_transaccion():
+            return super().obtener_por_id(id)
+
+        entidad = self._cache.obtener(id)
+        if entidad is None:
+            # Si otro hilo invalida mientras se lee, lo leído no se guarda
+            generacion = self._cache.generacion
+            entidad = super().obtener_por_id(id)
+            if entidad is None:
+                return None
+            self._cache.guardar(id, copy.copy(entidad), generacion=generacion)
+            return entidad
+
+        return copy.copy(entidad)
+
+    @classmethod
+    def estadisticas_cache(cls) -> dict[str, int]:
+        return cls._cache.estadisticas()
+
+    @classmethod
+    def limpiar_cache(cls) -> None:
+        cls._cache.limpiar()
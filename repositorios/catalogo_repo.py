@@ -0,0 +1,88 @@
+from collections.abc import Iterable
+
+from modelos.catalogo import EmpresaCatalogo, PlanCatalogo
+from db.connection import db
+
+
+class CatalogoRepositorio:
+    """
+    Consultas de solo lectura para el catálogo público (empresas + planes).
+    """
+
+    def ultimo_cambio(self) -> int:
+        """
+        Número del último cambio registrado en catalogo_versiones (0 si no hay).
+        """
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COALESCE(MAX(cambio), 0) FROM catalogo_versiones")
+            return cur.fetchone()[0]
+
+    def empresas_cambiadas(self, despues_de: int) -> tuple[list[int], int]:
+        """
+        Retorna (ids de empresas con cambios posteriores a 'despues_de',
+        último número de cambio).
+        """
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT empresa_id, cambio
+                FROM catalogo_versiones
+                WHERE cambio > ?
+                """,
+                (despues_de,),
+            )
+            rows = cur.fetchall()
+
+        return [r[0] for r in rows], max((r[1] for r in rows), default=despues_de)
+
+    def listar_empresas_con_planes(
+        self, empresa_ids: Iterable[int] | None = None
+    ) -> list[EmpresaCatalogo]:
+        """
+        Retorna las empresas con sus planes en una sola consulta (LEFT JOIN).
+        Si se pasan 'empresa_ids' solo se leen esas empresas; las que ya no
+        existen no aparecen en el resultado.
+        """
+        sql = """
+            SELECT e.id, e.nombre, e.email_contacto,
+                   p.id, p.nombre, p.bajada_mbps, p.subida_mbps,
+                   p.contencion, p.precio_clp, p.descripcion
+            FROM empresas e
+            LEFT JOIN planes p ON p.empresa_id = e.id
+        """
+        params: list[int] = []
+        if empresa_ids is not None:
+            params = list(empresa_ids)
+            if not params:
+                return []
+            sql += f" WHERE e.id IN ({', '.join('?' * len(params))})"
+        sql += " ORDER BY e.id, p.precio_clp, p.id"
+
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+
+        empresas: list[EmpresaCatalogo] = []
+        planes: list[PlanCatalogo] = []
+        for i, row in enumerate(rows):
+            if row[3] is not None:
+                planes.append(
+                    PlanCatalogo(
+                        id=row[3],
+                        nombre=row[4],
+                        bajada_mbps=row[5],
+                        subida_mbps=row[6],
+                        contencion=row[7],
+                        precio_clp=row[8],
+                        descripcion=row[9] or "",
+                    )
+                )
+            # Última fila de esta empresa: se cierra su lista de planes
+            if i + 1 == len(rows) or rows[i + 1][0] != row[0]:
+                empresas.append(EmpresaCatalogo(row[0], row[1], row[2], tuple(planes)))
+                planes = []
+
+        return empresas
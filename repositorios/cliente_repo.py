@@ -1,9 +1,15 @@
+from config import REPOSITORIOS_CACHE_CAPACIDAD, REPOSITORIOS_CACHE_TTL
 from modelos.cliente import Cliente
 from repositorios.base import BaseRepositorio
+from repositorios.cache_por_id import CachePorIdMixin, invalidar_al_confirmar
 from db.connection import db
+from utilidades.cache import CacheLRU
 
 
 class ClienteRepositorio(BaseRepositorio[Cliente]):
+    _TABLA = "clientes"
+    _COLUMNAS = ("nombre", "rut", "email", "telefono")
+
     def crear(self, cliente: Cliente) -> Cliente:
         """
         Inserta un nuevo cliente.
@@ -62,6 +68,7 @@ class ClienteRepositorio(BaseRepositorio[Cliente]):
                 """,
                 (cliente.nombre, cliente.rut, cliente.email, cliente.telefono, cliente.id),
             )
+        invalidar_al_confirmar(self._TABLA, cliente.id)
         return cliente
 
     def eliminar(self, cliente_id: int) -> None:
@@ -75,6 +82,10 @@ class ClienteRepositorio(BaseRepositorio[Cliente]):
                 """,
                 (cliente_id,),
             )
+        invalidar_al_confirmar(self._TABLA, cliente_id)
+
+    def _entidad_a_fila(self, cliente: Cliente) -> tuple:
+        return (cliente.nombre, cliente.rut, cliente.email, cliente.telefono)
 
     def _row_to_entity(self, row) -> Cliente:
         return Cliente(
@@ -84,3 +95,10 @@ class ClienteRepositorio(BaseRepositorio[Cliente]):
             email=row[3],
             telefono=row[4],
         )
+
+
+class ClienteRepositorioCacheado(CachePorIdMixin, ClienteRepositorio):
+    """
+    ClienteRepositorio con caché LRU en obtener_por_id().
+    """
+    _cache = CacheLRU(REPOSITORIOS_CACHE_CAPACIDAD, ttl=REPOSITORIOS_CACHE_TTL)
@@ -1,10 +1,25 @@
 from datetime import date
-from modelos.contrato import ContratoPlan
+from modelos.contrato import ContratoDetalle, ContratoPlan
 from repositorios.base import BaseRepositorio
 from db.connection import db
 
 
 class ContratoRepositorio(BaseRepositorio[ContratoPlan]):
+    _TABLA = "contratos"
+    _COLUMNAS = ("cliente_id", "plan_id", "fecha_inicio", "fecha_fin", "estado")
+
+    # Contrato + cliente + plan + empresa en una sola consulta
+    _SQL_DETALLE = """
+        SELECT c.id, c.fecha_inicio, c.fecha_fin, c.estado,
+               cl.id, cl.nombre,
+               p.id, p.nombre, p.bajada_mbps, p.subida_mbps, p.precio_clp,
+               e.id, e.nombre
+        FROM contratos c
+        JOIN clientes cl ON cl.id = c.cliente_id
+        JOIN planes p ON p.id = c.plan_id
+        JOIN empresas e ON e.id = p.empresa_id
+    """
+
     def crear(self, contrato: ContratoPlan) -> ContratoPlan:
         with db.get_connection() as conn:
             cur = conn.cursor()
@@ -68,6 +83,76 @@ class ContratoRepositorio(BaseRepositorio[ContratoPlan]):
 
         return [self._row_to_entity(r) for r in rows]
 
+    def listar_contratos_detallados(self, cliente_id: int) -> list[ContratoDetalle]:
+        """
+        Contratos del cliente con su plan y empresa, del más reciente al más
+        antiguo.
+        """
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                {self._SQL_DETALLE}
+                WHERE c.cliente_id = ?
+                ORDER BY c.id DESC
+                """,
+                (cliente_id,),
+            )
+            rows = cur.fetchall()
+
+        return [self._row_to_detalle(r) for r in rows]
+
+    def listar_contratos_detallados_pagina(self, despues_de_id: int = 0,
+                                           limite: int = 100,
+                                           estado: str | None = None
+                                           ) -> list[ContratoDetalle]:
+        """
+        Todos los contratos con su cliente, plan y empresa (vista de admin),
+        paginados por id igual que listar_pagina(). Se puede filtrar por estado.
+        """
+        if limite <= 0:
+            raise ValueError("El límite de la página debe ser mayor a 0")
+
+        condicion, params = "", [despues_de_id]
+        if estado is not None:
+            condicion = " AND c.estado = ?"
+            params.append(estado)
+
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                {self._SQL_DETALLE}
+                WHERE c.id > ?{condicion}
+                ORDER BY c.id
+                LIMIT ?
+                """,
+                (*params, limite),
+            )
+            rows = cur.fetchall()
+
+        return [self._row_to_detalle(r) for r in rows]
+
+    def tiene_contrato_activo(self, cliente_id: int) -> bool:
+        """
+        Indica si el cliente tiene un contrato activo. Usa el índice parcial
+        idx_contratos_activo_unico: no depende de cuántos contratos
+        históricos tenga el cliente.
+        """
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT EXISTS (
+                    SELECT 1
+                    FROM contratos
+                    WHERE cliente_id = ? AND estado = 'activo'
+                )
+                """,
+                (cliente_id,),
+            )
+            return bool(cur.fetchone()[0])
+
     def actualizar(self, contrato: ContratoPlan) -> ContratoPlan:
         if contrato.id is None:
             raise ValueError("No se puede actualizar un contrato sin id")
@@ -103,6 +188,32 @@ class ContratoRepositorio(BaseRepositorio[ContratoPlan]):
                 (contrato_id,),
             )
 
+    def _entidad_a_fila(self, contrato: ContratoPlan) -> tuple:
+        return (
+            contrato.cliente_id,
+            contrato.plan_id,
+            contrato.fecha_inicio.isoformat(),
+            contrato.fecha_fin.isoformat() if contrato.fecha_fin else None,
+            contrato.estado,
+        )
+
+    def _row_to_detalle(self, row) -> ContratoDetalle:
+        return ContratoDetalle(
+            contrato_id=row[0],
+            fecha_inicio=date.fromisoformat(row[1]),
+            fecha_fin=date.fromisoformat(row[2]) if row[2] else None,
+            estado=row[3],
+            cliente_id=row[4],
+            cliente_nombre=row[5],
+            plan_id=row[6],
+            plan_nombre=row[7],
+            bajada_mbps=row[8],
+            subida_mbps=row[9],
+            precio_clp=row[10],
+            empresa_id=row[11],
+            empresa_nombre=row[12],
+        )
+
     def _row_to_entity(self, row) -> ContratoPlan:
         return ContratoPlan(
             id=row[0],
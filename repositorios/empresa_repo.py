@@ -1,9 +1,20 @@
+from config import REPOSITORIOS_CACHE_CAPACIDAD, REPOSITORIOS_CACHE_TTL
 from modelos.empresa import Empresa
 from repositorios.base import BaseRepositorio
+from repositorios.cache_por_id import (
+    CachePorIdMixin,
+    invalidar_al_confirmar,
+    invalidar_si_al_confirmar,
+)
+from repositorios.plan_repo import PlanRepositorio
 from db.connection import db
+from utilidades.cache import CacheLRU
 
 
 class EmpresaRepositorio(BaseRepositorio[Empresa]):
+    _TABLA = "empresas"
+    _COLUMNAS = ("nombre", "rut", "email_contacto")
+
     def crear(self, empresa: Empresa) -> Empresa:
         with db.get_connection() as conn:
             cur = conn.cursor()
@@ -59,6 +70,7 @@ class EmpresaRepositorio(BaseRepositorio[Empresa]):
                 """,
                 (empresa.nombre, empresa.rut, empresa.email_contacto, empresa.id),
             )
+        invalidar_al_confirmar(self._TABLA, empresa.id)
         return empresa
 
     def eliminar(self, empresa_id: int) -> None:
@@ -71,9 +83,17 @@ class EmpresaRepositorio(BaseRepositorio[Empresa]):
                 """,
                 (empresa_id,),
             )
+        invalidar_al_confirmar(self._TABLA, empresa_id)
+        # ON DELETE CASCADE también borró sus planes
+        invalidar_si_al_confirmar(
+            PlanRepositorio._TABLA, lambda _, plan: plan.empresa_id == empresa_id
+        )
 
     # ---------- Helper interno ----------
 
+    def _entidad_a_fila(self, empresa: Empresa) -> tuple:
+        return (empresa.nombre, empresa.rut, empresa.email_contacto)
+
     def _row_to_entity(self, row) -> Empresa:
         return Empresa(
             id=row[0],
@@ -81,3 +101,10 @@ class EmpresaRepositorio(BaseRepositorio[Empresa]):
             rut=row[2],
             email_contacto=row[3],
         )
+
+
+class EmpresaRepositorioCacheado(CachePorIdMixin, EmpresaRepositorio):
+    """
+    EmpresaRepositorio con caché LRU en obtener_por_id().
+    """
+    _cache = CacheLRU(REPOSITORIOS_CACHE_CAPACIDAD, ttl=REPOSITORIOS_CACHE_TTL)
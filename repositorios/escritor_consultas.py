@@ -0,0 +1,162 @@
+# repositorios/escritor_consultas.py
+
+"""
+Escritura en lotes del registro de consultas de indicadores.
+
+Registrar cada consulta con su propio INSERT y commit cuesta más que
+responder la consulta desde el caché. EscritorConsultas las acumula en
+una cola en memoria y un hilo de fondo las escribe con
+IndicadoresRepositorio.registrar_consultas (executemany) cuando se junta
+un lote o pasa el intervalo configurado.
+
+- La cola es acotada: si la BD no da abasto, registrar() espera (y
+  eventualmente falla) en vez de acumular memoria sin límite.
+- Si una consulta del lote viola una restricción, solo esa se descarta
+  (cuenta en 'fallidas'); el resto del lote se escribe igual.
+- cerrar() escribe todo lo pendiente; se llama solo al terminar el programa.
+"""
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+from config import (
+    AUDITORIA_CAPACIDAD,
+    AUDITORIA_INTERVALO,
+    AUDITORIA_TAMANO_LOTE,
+    AUDITORIA_TIMEOUT_ENCOLAR,
+)
+from modelos.indicadores import ConsultaIndicador
+from repositorios.indicadores_repo import IndicadoresRepositorio
+
+logger = logging.getLogger(__name__)
+
+# Marca que le indica al hilo que escriba lo pendiente y termine
+_FIN = object()
+
+
+class EscritorConsultas:
+    """
+    Cola acotada de ConsultaIndicador más un hilo que las escribe en lotes.
+    """
+
+    def __init__(self, repo: IndicadoresRepositorio | None = None,
+                 tamano_lote: int = AUDITORIA_TAMANO_LOTE,
+                 intervalo: float = AUDITORIA_INTERVALO,
+                 capacidad: int = AUDITORIA_CAPACIDAD,
+                 timeout_encolar: float = AUDITORIA_TIMEOUT_ENCOLAR):
+        self.repo = repo or IndicadoresRepositorio()
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.timeout_encolar = timeout_encolar
+
+        self._cola: queue.Queue = queue.Queue(maxsize=capacidad)
+        self._lock = threading.Lock()
+        self._hilo: threading.Thread | None = None
+        self._cerrado = False
+
+        self.escritas = 0
+        self.fallidas = 0
+
+    # ---------- Hilo de escritura ----------
+
+    def _escribir_partes(self, lote: list[ConsultaIndicador]) -> None:
+        """
+        Escribe el lote. Si una fila viola una restricción (por ejemplo, un
+        usuario_id que ya no existe), lo divide en mitades y reintenta,
+        para descartar solo las filas con problemas.
+        """
+        try:
+            self.escritas += self.repo.registrar_consultas(lote)
+        except sqlite3.IntegrityError:
+            if len(lote) == 1:
+                self.fallidas += 1
+                logger.exception("No se pudo registrar la consulta del usuario %s",
+                                 lote[0].usuario_id)
+                return
+            mitad = len(lote) // 2
+            self._escribir_partes(lote[:mitad])
+            self._escribir_partes(lote[mitad:])
+
+    def _escribir(self, lote: list[ConsultaIndicador]) -> None:
+        try:
+            self._escribir_partes(lote)
+        except Exception:
+            self.fallidas += len(lote)
+            logger.exception("No se pudieron registrar %d consultas de indicadores", len(lote))
+        finally:
+            for _ in lote:
+                self._cola.task_done()
+
+    def _bucle(self) -> None:
+        lote: list[ConsultaIndicador] = []
+        limite = time.monotonic() + self.intervalo
+
+        while True:
+            try:
+                item = self._cola.get(timeout=max(0.0, limite - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _FIN:
+                if lote:
+                    self._escribir(lote)
+                self._cola.task_done()
+                return
+
+            if item is not None:
+                lote.append(item)
+
+            if len(lote) >= self.tamano_lote or time.monotonic() >= limite:
+                if lote:
+                    self._escribir(lote)
+                    lote = []
+                limite = time.monotonic() + self.intervalo
+
+    def _asegurar_hilo(self) -> None:
+        with self._lock:
+            if self._hilo is None:
+                self._hilo = threading.Thread(
+                    target=self._bucle, name="escritor-consultas", daemon=True
+                )
+                self._hilo.start()
+
+    # ---------- API pública ----------
+
+    def registrar(self, consulta: ConsultaIndicador) -> None:
+        """
+        Encola la consulta para escribirla en el próximo lote.
+
+        Si la cola está llena espera hasta 'timeout_encolar' segundos;
+        después lanza queue.Full.
+        """
+        if self._cerrado:
+            raise RuntimeError("El escritor de consultas está cerrado")
+        self._asegurar_hilo()
+        self._cola.put(consulta, timeout=self.timeout_encolar)
+
+    def vaciar(self) -> None:
+        """
+        Espera a que todas las consultas encoladas hasta ahora estén escritas.
+        """
+        if self._hilo is not None:
+            self._cola.join()
+
+    def cerrar(self) -> None:
+        """
+        Escribe lo pendiente y detiene el hilo. No se aceptan más consultas.
+        """
+        if self._cerrado:
+            return
+        self._cerrado = True
+        if self._hilo is not None:
+            self._cola.put(_FIN)
+            self._hilo.join()
+
+
+# Instancia global que usa el servicio de indicadores
+escritor_consultas = EscritorConsultas()
+atexit.register(escritor_consultas.cerrar)
@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+from dataclasses import replace
 from datetime import date, datetime
 from modelos.indicadores import IndicadorEconomico, ConsultaIndicador
 from repositorios.base import BaseRepositorio
@@ -5,6 +7,11 @@ from db.connection import db
 
 
 class IndicadoresRepositorio(BaseRepositorio[IndicadorEconomico]):
+    _TABLA = "indicadores"
+    _COLUMNAS = ("nombre", "fecha_valor", "valor")
+    # Un indicador se identifica por su nombre y fecha (UNIQUE en el esquema)
+    _CLAVE_UPSERT = ("nombre", "fecha_valor")
+
     # ---------- CRUD básico sobre IndicadorEconomico ----------
 
     def crear(self, indicador: IndicadorEconomico) -> IndicadorEconomico:
@@ -21,8 +28,7 @@ class IndicadoresRepositorio(BaseRepositorio[IndicadorEconomico]):
                     indicador.valor,
                 ),
             )
-            indicador.id = cur.lastrowid
-        return indicador
+            return replace(indicador, id=cur.lastrowid)
 
     def obtener_por_id(self, indicador_id: int) -> IndicadorEconomico | None:
         with db.get_connection() as conn:
@@ -103,6 +109,24 @@ class IndicadoresRepositorio(BaseRepositorio[IndicadorEconomico]):
 
         return self._row_to_entity(row) if row else None
 
+    def listar_por_nombre_y_rango(
+        self, nombre: str, desde: date, hasta: date
+    ) -> list[IndicadorEconomico]:
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT id, nombre, fecha_valor, valor
+                FROM indicadores
+                WHERE nombre = ? AND fecha_valor BETWEEN ? AND ?
+                ORDER BY fecha_valor
+                """,
+                (nombre.upper(), desde.isoformat(), hasta.isoformat()),
+            )
+            rows = cur.fetchall()
+
+        return [self._row_to_entity(r) for r in rows]
+
     # ---------- Manejo de consultas de indicadores ----------
 
     def registrar_consulta(self, consulta: ConsultaIndicador) -> ConsultaIndicador:
@@ -121,8 +145,26 @@ class IndicadoresRepositorio(BaseRepositorio[IndicadorEconomico]):
                     consulta.fuente,
                 ),
             )
-            consulta.id = cur.lastrowid
-        return consulta
+            return replace(consulta, id=cur.lastrowid)
+
+    def registrar_consultas(self, consultas: Iterable[ConsultaIndicador]) -> int:
+        """
+        Inserta muchas consultas con executemany en una sola transacción.
+        Retorna la cantidad insertada. No asigna ids a las consultas.
+        """
+        with db.get_connection() as conn:
+            cur = conn.executemany(
+                """
+                INSERT INTO consultas_indicadores
+                (indicador_id, usuario_id, fecha_consulta, fuente)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    (c.indicador_id, c.usuario_id, c.fecha_consulta.isoformat(), c.fuente)
+                    for c in consultas
+                ),
+            )
+            return cur.rowcount
 
     def listar_consultas_por_usuario(self, usuario_id: int) -> list[ConsultaIndicador]:
         with db.get_connection() as conn:
@@ -139,8 +181,73 @@ class IndicadoresRepositorio(BaseRepositorio[IndicadorEconomico]):
 
         return [self._row_to_consulta(r) for r in rows]
 
+    # ---------- Retención de consultas ----------
+
+    def compactar_consultas_lote(self, antes_de: datetime, limite: int) -> int:
+        """
+        Suma al resumen diario (consultas_indicadores_diarias) hasta 'limite'
+        consultas anteriores a 'antes_de' y las borra, en una transacción.
+        Retorna cuántas consultas se compactaron (0 = no quedan).
+        """
+        lote = """
+            SELECT id, usuario_id, indicador_id, fecha_consulta
+            FROM consultas_indicadores
+            WHERE fecha_consulta < ?
+            ORDER BY fecha_consulta, id
+            LIMIT ?
+        """
+        params = (antes_de.isoformat(), limite)
+
+        with db.transaccion() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                INSERT INTO consultas_indicadores_diarias
+                (usuario_id, indicador_id, dia, cantidad)
+                SELECT usuario_id, indicador_id, substr(fecha_consulta, 1, 10), COUNT(*)
+                FROM ({lote})
+                WHERE true
+                GROUP BY usuario_id, indicador_id, substr(fecha_consulta, 1, 10)
+                ON CONFLICT (usuario_id, indicador_id, dia)
+                DO UPDATE SET cantidad = cantidad + excluded.cantidad
+                """,
+                params,
+            )
+            cur.execute(
+                f"""
+                DELETE FROM consultas_indicadores
+                WHERE id IN (SELECT id FROM ({lote}))
+                """,
+                params,
+            )
+            return cur.rowcount
+
+    def listar_resumen_consultas_por_usuario(
+        self, usuario_id: int
+    ) -> list[tuple[int, date, int]]:
+        """
+        Retorna (indicador_id, dia, cantidad) de las consultas ya compactadas.
+        """
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT indicador_id, dia, cantidad
+                FROM consultas_indicadores_diarias
+                WHERE usuario_id = ?
+                ORDER BY dia
+                """,
+                (usuario_id,),
+            )
+            rows = cur.fetchall()
+
+        return [(r[0], date.fromisoformat(r[1]), r[2]) for r in rows]
+
     # ---------- Helpers internos ----------
 
+    def _entidad_a_fila(self, indicador: IndicadorEconomico) -> tuple:
+        return (indicador.nombre, indicador.fecha_valor.isoformat(), indicador.valor)
+
     def _row_to_entity(self, row) -> IndicadorEconomico:
         return IndicadorEconomico(
             id=row[0],
@@ -0,0 +1,28 @@
+from db.connection import db
+
+
+class LimitesLoginRepositorio:
+    """
+    Guarda y lee el estado de los limitadores de login (tabla limites_login).
+    """
+
+    def reemplazar(self, filas: list[tuple[str, float, float]]) -> None:
+        """
+        Reemplaza todo el estado guardado por 'filas' (clave, fichas,
+        actualizado) en una sola transacción.
+        """
+        with db.transaccion() as conn:
+            conn.execute("DELETE FROM limites_login")
+            conn.executemany(
+                """
+                INSERT INTO limites_login (clave, fichas, actualizado)
+                VALUES (?, ?, ?)
+                """,
+                filas,
+            )
+
+    def listar(self) -> list[tuple[str, float, float]]:
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT clave, fichas, actualizado FROM limites_login")
+            return cur.fetchall()
@@ -1,9 +1,16 @@
+from config import REPOSITORIOS_CACHE_CAPACIDAD, REPOSITORIOS_CACHE_TTL
 from modelos.plan import Plan
 from repositorios.base import BaseRepositorio
+from repositorios.cache_por_id import CachePorIdMixin, invalidar_al_confirmar
 from db.connection import db
+from utilidades.cache import CacheLRU
 
 
 class PlanRepositorio(BaseRepositorio[Plan]):
+    _TABLA = "planes"
+    _COLUMNAS = ("empresa_id", "nombre", "bajada_mbps", "subida_mbps",
+                 "contencion", "precio_clp", "descripcion")
+
     def crear(self, plan: Plan) -> Plan:
         """
         Inserta un nuevo plan en la tabla 'planes'.
@@ -99,6 +106,7 @@ class PlanRepositorio(BaseRepositorio[Plan]):
                     plan.id,
                 ),
             )
+        invalidar_al_confirmar(self._TABLA, plan.id)
         return plan
 
     def eliminar(self, plan_id: int) -> None:
@@ -111,6 +119,18 @@ class PlanRepositorio(BaseRepositorio[Plan]):
                 """,
                 (plan_id,),
             )
+        invalidar_al_confirmar(self._TABLA, plan_id)
+
+    def _entidad_a_fila(self, plan: Plan) -> tuple:
+        return (
+            plan.empresa_id,
+            plan.nombre,
+            plan.bajada_mbps,
+            plan.subida_mbps,
+            plan.contencion,
+            plan.precio_clp,
+            plan.descripcion,
+        )
 
     def _row_to_entity(self, row) -> Plan:
         return Plan(
@@ -123,3 +143,10 @@ class PlanRepositorio(BaseRepositorio[Plan]):
             precio_clp=row[6],
             descripcion=row[7] or "",
         )
+
+
+class PlanRepositorioCacheado(CachePorIdMixin, PlanRepositorio):
+    """
+    PlanRepositorio con caché LRU en obtener_por_id().
+    """
+    _cache = CacheLRU(REPOSITORIOS_CACHE_CAPACIDAD, ttl=REPOSITORIOS_CACHE_TTL)
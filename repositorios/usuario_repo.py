@@ -1,11 +1,27 @@
 # repositorios/usuario_repo.py
 
+import copy
+from collections.abc import Iterable, Iterator
+
+from config import USUARIOS_CACHE_CAPACIDAD, USUARIOS_CACHE_TTL
 from modelos.usuario import Usuario, RolUsuario
 from repositorios.base import BaseRepositorio
 from db.connection import db
+from utilidades.cache import CacheLRU
+
+# Marca en caché para "ese nombre de usuario no existe"
+_NO_EXISTE = object()
 
 
 class UsuarioRepositorio(BaseRepositorio[Usuario]):
+    _TABLA = "usuarios"
+    _COLUMNAS = ("nombre_usuario", "contrasena", "rol")
+    _CLAVE_UPSERT = ("nombre_usuario",)
+
+    # Caché de obtener_por_nombre() compartido por todas las instancias.
+    # Guarda también los nombres inexistentes, así una ráfaga de logins
+    # fallidos tampoco llega a la BD. Se invalida al confirmar cada cambio.
+    _cache = CacheLRU(USUARIOS_CACHE_CAPACIDAD, ttl=USUARIOS_CACHE_TTL)
 
     # ==========================================================================
     # Métodos requeridos por BaseRepositorio (del profe)
@@ -40,6 +56,7 @@ class UsuarioRepositorio(BaseRepositorio[Usuario]):
                 (usuario.nombre_usuario, usuario.contrasena, usuario.rol.value)
             )
             usuario.id = cur.lastrowid
+        db.al_confirmar(self._cache.invalidar, usuario.nombre_usuario)
         return usuario
 
     def obtener_por_id(self, usuario_id: int) -> Usuario | None:
@@ -58,6 +75,30 @@ class UsuarioRepositorio(BaseRepositorio[Usuario]):
         return self._fila_a_usuario(fila) if fila else None
 
     def obtener_por_nombre(self, nombre_usuario: str) -> Usuario | None:
+        """
+        Busca el usuario por nombre, primero en el caché. Dentro de una
+        transacción abierta se lee directo de la BD.
+        """
+        if db.en_transaccion():
+            return self._obtener_por_nombre_bd(nombre_usuario)
+
+        en_cache = self._cache.obtener(nombre_usuario)
+        if en_cache is _NO_EXISTE:
+            return None
+        if en_cache is not None:
+            return copy.copy(en_cache)
+
+        # Si otro hilo invalida mientras se lee, lo leído no se guarda
+        generacion = self._cache.generacion
+        usuario = self._obtener_por_nombre_bd(nombre_usuario)
+        self._cache.guardar(
+            nombre_usuario,
+            copy.copy(usuario) if usuario else _NO_EXISTE,
+            generacion=generacion,
+        )
+        return usuario
+
+    def _obtener_por_nombre_bd(self, nombre_usuario: str) -> Usuario | None:
         with db.get_connection() as conn:
             cur = conn.cursor()
             cur.execute(
@@ -96,19 +137,70 @@ class UsuarioRepositorio(BaseRepositorio[Usuario]):
                 """,
                 (usuario.nombre_usuario, usuario.contrasena, usuario.rol.value, usuario.id)
             )
+        # El nombre pudo cambiar: se invalida por id y también el nombre nuevo
+        db.al_confirmar(self._invalidar_id, usuario.id)
+        db.al_confirmar(self._cache.invalidar, usuario.nombre_usuario)
         return usuario
 
+    def reemplazar_contrasena(self, usuario_id: int, anterior: str, nueva: str) -> bool:
+        """
+        Cambia solo el hash de la contraseña, si sigue siendo 'anterior'
+        (compare-and-set). No toca el nombre ni el rol, que pudo cambiar otro
+        proceso. Retorna False si el hash ya era otro.
+        """
+        with db.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE usuarios
+                SET contrasena = ?
+                WHERE id = ? AND contrasena = ?
+                """,
+                (nueva, usuario_id, anterior)
+            )
+            reemplazada = cur.rowcount == 1
+        db.al_confirmar(self._invalidar_id, usuario_id)
+        return reemplazada
+
     def eliminar(self, usuario_id: int) -> None:
         with db.get_connection() as conn:
             cur = conn.cursor()
             cur.execute(
                 "DELETE FROM usuarios WHERE id = ?", (usuario_id,)
             )
+        db.al_confirmar(self._invalidar_id, usuario_id)
+
+    def crear_muchos(self, usuarios: Iterable[Usuario]) -> list[int]:
+        return super().crear_muchos(self._invalidar_al_confirmar(usuarios))
+
+    def upsert_muchos(self, usuarios: Iterable[Usuario]) -> list[int]:
+        return super().upsert_muchos(self._invalidar_al_confirmar(usuarios))
 
     # ==========================================================================
     # Helper interno
     # ==========================================================================
 
+    def _invalidar_al_confirmar(self, usuarios: Iterable[Usuario]) -> Iterator[Usuario]:
+        """
+        Entrega los usuarios tal cual y programa la invalidación de cada
+        nombre para el commit, sin armar una lista (se consume dentro de la
+        transacción de crear_muchos/upsert_muchos).
+        """
+        for usuario in usuarios:
+            db.al_confirmar(self._cache.invalidar, usuario.nombre_usuario)
+            yield usuario
+
+    def _invalidar_id(self, usuario_id: int) -> None:
+        self._cache.invalidar_si(
+            lambda _, u: u is not _NO_EXISTE and u.id == usuario_id
+        )
+
+    def _entidad_a_fila(self, usuario: Usuario) -> tuple:
+        return (usuario.nombre_usuario, usuario.contrasena, usuario.rol.value)
+
+    def _row_to_entity(self, fila) -> Usuario:
+        return self._fila_a_usuario(fila)
+
     def _fila_a_usuario(self, fila) -> Usuario:
         return Usuario(
             id=fila[0],
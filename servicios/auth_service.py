@@ -7,11 +7,26 @@ Aquí se maneja:
 - Registrar nuevos usuarios con contraseña hasheada
 - Autenticar usuarios existentes comparando hashes
 - Validar formato de contraseña
+
+El hash lo calcula servicios/hashing.py con el algoritmo y costo de
+config.py. Al iniciar sesión con un hash antiguo (otro algoritmo u otro
+costo) se reemplaza por uno nuevo.
+
+Los intentos de login pasan primero por servicios/limite_login.py: los
+que superan el límite se rechazan sin tocar la BD ni calcular hashes.
+
+Los hashes corren en el pool de servicios/ejecutor_hashing.py, no en el
+hilo que llama. registrar_usuario_async() y autenticar_async() son las
+variantes para asyncio.
 """
 
-import hashlib
+import asyncio
+import sqlite3
 from modelos.usuario import Usuario, RolUsuario
 from repositorios.usuario_repo import UsuarioRepositorio
+from servicios import hashing
+from servicios.ejecutor_hashing import EjecutorHashing, ejecutor_hashing
+from servicios.limite_login import LimiteLogin, limite_login
 
 
 class AuthService:
@@ -19,8 +34,16 @@ class AuthService:
     Lógica de autenticación del sistema.
     """
 
-    def __init__(self):
+    def __init__(self, hasher: hashing.Hasher | None = None,
+                 ejecutor: EjecutorHashing | None = None,
+                 limite: LimiteLogin | None = None):
         self.repo = UsuarioRepositorio()
+        self.hasher = hasher or hashing.crear_hasher()
+        self.ejecutor = ejecutor or ejecutor_hashing
+        self.limite = limite or limite_login
+        # Hash de "" para gastar el mismo tiempo cuando el usuario no existe,
+        # así la demora no revela si un nombre de usuario está registrado.
+        self._hash_ficticio: str | None = None
 
     # ---------------------------
     # Utilidades internas
@@ -28,9 +51,44 @@ class AuthService:
 
     def _hash_password(self, password: str) -> str:
         """
-        Hashea una contraseña usando SHA256 (suficiente para proyecto académico).
+        Hashea una contraseña con el hasher configurado (sal aleatoria).
         """
-        return hashlib.sha256(password.encode("utf-8")).hexdigest()
+        return self.ejecutor.ejecutar(self.hasher.hashear, password)
+
+    def _verificar_password(self, password: str, codificado: str | None) -> bool:
+        """
+        Compara la contraseña con el hash guardado. Con codificado=None (el
+        usuario no existe) compara contra el hash ficticio y retorna False.
+        """
+        if codificado is None:
+            if self._hash_ficticio is None:
+                self._hash_ficticio = self._hash_password("")
+            self.ejecutor.ejecutar(hashing.verificar, password, self._hash_ficticio)
+            return False
+        return self.ejecutor.ejecutar(hashing.verificar, password, codificado)
+
+    async def _hash_password_async(self, password: str) -> str:
+        return await self.ejecutor.ejecutar_async(self.hasher.hashear, password)
+
+    async def _verificar_password_async(self, password: str, codificado: str | None) -> bool:
+        if codificado is None:
+            if self._hash_ficticio is None:
+                self._hash_ficticio = await self._hash_password_async("")
+            await self.ejecutor.ejecutar_async(hashing.verificar, password, self._hash_ficticio)
+            return False
+        return await self.ejecutor.ejecutar_async(hashing.verificar, password, codificado)
+
+    def _guardar_nuevo(self, usuario: Usuario) -> Usuario:
+        """
+        Que el nombre no exista lo garantiza el UNIQUE de la tabla: se hace
+        un solo INSERT en vez de buscar primero y luego insertar.
+        """
+        try:
+            return self.repo.crear(usuario)
+        except sqlite3.IntegrityError as e:
+            if _es_nombre_usuario_duplicado(e):
+                raise ValueError("Ese nombre de usuario ya está registrado.") from e
+            raise
 
     def _validar_password(self, password: str) -> None:
         """
@@ -47,18 +105,12 @@ class AuthService:
         """
         Crea un nuevo usuario:
         - valida contraseña
-        - valida que no exista el usuario
         - hashea contraseña
-        - lo guarda en base de datos
+        - lo guarda en base de datos (falla si el nombre ya existe)
         """
         # Validar contraseña
         self._validar_password(password)
 
-        # Revisar si ya existe
-        existente = self.repo.obtener_por_nombre(nombre_usuario)
-        if existente:
-            raise ValueError("Ese nombre de usuario ya está registrado.")
-
         # Crear objeto Usuario
         nuevo_usuario = Usuario(
             id=None,
@@ -68,20 +120,75 @@ class AuthService:
         )
 
         # Guardar
-        return self.repo.crear(nuevo_usuario)
+        return self._guardar_nuevo(nuevo_usuario)
 
-    def autenticar(self, nombre_usuario: str, password: str) -> Usuario | None:
+    def autenticar(self, nombre_usuario: str, password: str,
+                   origen: str | None = None) -> Usuario | None:
         """
         Valida credenciales:
-        - obtiene usuario por nombre
+        - aplica el límite de intentos por usuario y por 'origen' (IP,
+          terminal, ...); si se supera lanza DemasiadosIntentos
+        - obtiene usuario por nombre (desde el caché de credenciales si está)
         - compara hash
+        - si el hash usa parámetros antiguos, lo reemplaza
         - retorna el usuario si coincide
         """
+        self.limite.verificar(nombre_usuario, origen)
+
         usuario = self.repo.obtener_por_nombre(nombre_usuario)
-        if not usuario:
+        if not self._verificar_password(password, usuario.contrasena if usuario else None):
             return None
 
-        if usuario.contrasena == self._hash_password(password):
-            return usuario
+        self.limite.exito(nombre_usuario)
+        if self.hasher.necesita_rehash(usuario.contrasena):
+            nuevo = self._hash_password(password)
+            if self.repo.reemplazar_contrasena(usuario.id, usuario.contrasena, nuevo):
+                usuario.contrasena = nuevo
+
+        return usuario
+
+    # ---------------------------
+    # Variante asyncio
+    # ---------------------------
 
-        return None
+    async def registrar_usuario_async(self, nombre_usuario: str, password: str,
+                                      rol: RolUsuario) -> Usuario:
+        """
+        Igual que registrar_usuario(), sin bloquear el event loop.
+        """
+        self._validar_password(password)
+        nuevo_usuario = Usuario(
+            id=None,
+            nombre_usuario=nombre_usuario,
+            contrasena=await self._hash_password_async(password),
+            rol=rol
+        )
+        return await asyncio.to_thread(self._guardar_nuevo, nuevo_usuario)
+
+    async def autenticar_async(self, nombre_usuario: str, password: str,
+                               origen: str | None = None) -> Usuario | None:
+        """
+        Igual que autenticar(), sin bloquear el event loop.
+        """
+        self.limite.verificar(nombre_usuario, origen)
+
+        usuario = await asyncio.to_thread(self.repo.obtener_por_nombre, nombre_usuario)
+        codificado = usuario.contrasena if usuario else None
+        if not await self._verificar_password_async(password, codificado):
+            return None
+
+        self.limite.exito(nombre_usuario)
+        if self.hasher.necesita_rehash(usuario.contrasena):
+            nuevo = await self._hash_password_async(password)
+            if await asyncio.to_thread(self.repo.reemplazar_contrasena,
+                                       usuario.id, usuario.contrasena, nuevo):
+                usuario.contrasena = nuevo
+
+        return usuario
+
+
+def _es_nombre_usuario_duplicado(error: sqlite3.IntegrityError) -> bool:
+    """
+    True si el error viene del UNIQUE de usuarios.nombre_usuario.
+    """
+    return "UNIQUE constraint failed: usuarios.nombre_usuario" in str(error)
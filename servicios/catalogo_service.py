@@ -0,0 +1,100 @@
+# servicios/catalogo_service.py
+
+"""
+Catálogo público: todas las empresas con sus planes.
+
+El catálogo se arma con una sola consulta (empresas LEFT JOIN planes) y se
+guarda en memoria como una foto inmutable (modelos/catalogo.py) que se
+puede compartir entre hilos sin copiarla.
+
+Para saber si está al día se consulta catalogo_versiones, que mantienen
+los triggers de la migración 0004: al cambiar una empresa o un plan, solo
+se vuelven a leer las empresas afectadas y se arma una foto nueva.
+"""
+
+import threading
+import time
+
+from config import CATALOGO_INTERVALO_REVISION
+from modelos.catalogo import Catalogo, EmpresaCatalogo
+from repositorios.catalogo_repo import CatalogoRepositorio
+
+# Con más empresas cambiadas que esto se reconstruye todo el catálogo
+_MAX_EMPRESAS_INCREMENTAL = 500
+
+
+class CatalogoService:
+
+    def __init__(self, repo: CatalogoRepositorio | None = None,
+                 intervalo_revision: float = CATALOGO_INTERVALO_REVISION):
+        self.repo = repo or CatalogoRepositorio()
+        self.intervalo_revision = intervalo_revision
+
+        self._catalogo: Catalogo | None = None
+        self._por_empresa: dict[int, EmpresaCatalogo] = {}
+        self._proxima_revision = 0.0
+        self._lock = threading.Lock()
+
+        self.reconstrucciones = 0
+        self.actualizaciones = 0
+
+    # ---------------------------
+    # Utilidades internas
+    # ---------------------------
+
+    def _reconstruir(self) -> int:
+        # El número de cambio se lee antes que los datos: un cambio que
+        # ocurra entremedio se vuelve a procesar en la próxima revisión.
+        cambio = self.repo.ultimo_cambio()
+        self._por_empresa = {e.id: e for e in self.repo.listar_empresas_con_planes()}
+        self.reconstrucciones += 1
+        return cambio
+
+    def _revisar(self) -> Catalogo:
+        if self._catalogo is None:
+            cambio = self._reconstruir()
+        else:
+            ids, cambio = self.repo.empresas_cambiadas(self._catalogo.cambio)
+            if not ids:
+                return self._catalogo
+
+            if len(ids) > _MAX_EMPRESAS_INCREMENTAL:
+                cambio = self._reconstruir()
+            else:
+                por_empresa = dict(self._por_empresa)
+                for empresa_id in ids:
+                    por_empresa.pop(empresa_id, None)
+                for empresa in self.repo.listar_empresas_con_planes(ids):
+                    por_empresa[empresa.id] = empresa
+                self._por_empresa = por_empresa
+                self.actualizaciones += 1
+
+        empresas = sorted(self._por_empresa.values(), key=lambda e: (e.nombre.lower(), e.id))
+        return Catalogo(tuple(empresas), cambio)
+
+    # ---------------------------
+    # Lógica principal
+    # ---------------------------
+
+    def obtener(self) -> Catalogo:
+        """
+        Retorna la foto actual del catálogo. Puede tener hasta
+        'intervalo_revision' segundos de atraso.
+        """
+        catalogo = self._catalogo
+        if catalogo is not None and time.monotonic() < self._proxima_revision:
+            return catalogo
+
+        with self._lock:
+            if self._catalogo is None or time.monotonic() >= self._proxima_revision:
+                self._catalogo = self._revisar()
+                self._proxima_revision = time.monotonic() + self.intervalo_revision
+            return self._catalogo
+
+    def obtener_empresa(self, empresa_id: int) -> EmpresaCatalogo | None:
+        self.obtener()
+        return self._por_empresa.get(empresa_id)
+
+
+# Instancia global: el catálogo se arma una vez por proceso
+catalogo_service = CatalogoService()
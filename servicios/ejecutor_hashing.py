@@ -0,0 +1,170 @@
+# servicios/ejecutor_hashing.py
+
+"""
+Ejecución de los hashes de contraseñas fuera del hilo que atiende la
+solicitud.
+
+Un hash cuesta decenas o cientos de milisegundos de CPU. EjecutorHashing
+los corre en un pool de hilos (hashlib libera el GIL mientras calcula, así
+que varios hashes avanzan en paralelo en distintos núcleos) o de procesos,
+según CONTRASENAS_EJECUTOR_MODO.
+
+- La cantidad de solicitudes en curso más en espera está acotada: si se
+  llena, las siguientes esperan un cupo y fallan con TimeoutError.
+- Cada solicitud tiene un tiempo máximo (incluyendo la espera); al vencer
+  se lanza TimeoutError y el hash se cancela si aún no empezó.
+- ejecutar() es la API síncrona y ejecutar_async() la de asyncio.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from config import (
+    CONTRASENAS_EJECUTOR_COLA,
+    CONTRASENAS_EJECUTOR_MODO,
+    CONTRASENAS_EJECUTOR_TIMEOUT,
+    CONTRASENAS_EJECUTOR_WORKERS,
+)
+
+MODOS = ("hilos", "procesos", None)
+
+
+class EjecutorHashing:
+
+    def __init__(self, modo: str | None = CONTRASENAS_EJECUTOR_MODO,
+                 workers: int | None = CONTRASENAS_EJECUTOR_WORKERS,
+                 cola: int = CONTRASENAS_EJECUTOR_COLA,
+                 timeout: float = CONTRASENAS_EJECUTOR_TIMEOUT):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de ejecución de hashes inválido: {modo}")
+        self.modo = modo
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+
+        self._cupos = threading.BoundedSemaphore(self.workers + cola)
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+        self._cerrado = False
+
+        self.ejecutadas = 0
+        self.rechazadas = 0
+        self.vencidas = 0
+
+    # ---------- Utilidades internas ----------
+
+    def _obtener_pool(self) -> Executor:
+        with self._lock:
+            if self._cerrado:
+                raise RuntimeError("El ejecutor de hashes está cerrado")
+            if self._pool is None:
+                if self.modo == "procesos":
+                    self._pool = ProcessPoolExecutor(self.workers)
+                else:
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="hashing")
+            return self._pool
+
+    def _reservar(self, limite: float) -> bool:
+        return self._cupos.acquire(timeout=max(0.0, limite - time.monotonic()))
+
+    def _liberar_si_reservado(self, espera: asyncio.Future) -> None:
+        if not espera.cancelled() and espera.exception() is None and espera.result():
+            self._cupos.release()
+
+    def _enviar(self, funcion: Callable[..., Any], *args) -> Future:
+        """
+        Envía la función al pool. El cupo ya debe estar reservado; se
+        libera cuando la función termina o se cancela.
+        """
+        try:
+            futuro = self._obtener_pool().submit(funcion, *args)
+        except BaseException:
+            self._cupos.release()
+            raise
+        futuro.add_done_callback(lambda _: self._cupos.release())
+        self.ejecutadas += 1
+        return futuro
+
+    def _rechazar(self) -> TimeoutError:
+        self.rechazadas += 1
+        return TimeoutError("Hay demasiadas contraseñas esperando ser verificadas")
+
+    def _vencer(self) -> TimeoutError:
+        self.vencidas += 1
+        return TimeoutError("La verificación de la contraseña tardó demasiado")
+
+    # ---------- API pública ----------
+
+    def ejecutar(self, funcion: Callable[..., Any], *args) -> Any:
+        """
+        Ejecuta funcion(*args) en el pool y espera el resultado.
+        En modo "procesos" la función y sus argumentos deben poder
+        serializarse con pickle (funciones de módulo o métodos de un Hasher).
+        """
+        if self.modo is None:
+            return funcion(*args)
+
+        limite = time.monotonic() + self.timeout
+        if not self._reservar(limite):
+            raise self._rechazar()
+
+        futuro = self._enviar(funcion, *args)
+        try:
+            return futuro.result(timeout=max(0.0, limite - time.monotonic()))
+        except concurrent.futures.TimeoutError:
+            futuro.cancel()
+            raise self._vencer() from None
+
+    async def ejecutar_async(self, funcion: Callable[..., Any], *args) -> Any:
+        """
+        Igual que ejecutar(), sin bloquear el event loop.
+        """
+        if self.modo is None:
+            return await asyncio.to_thread(funcion, *args)
+
+        limite = time.monotonic() + self.timeout
+        # Si no hay cupo libre, la espera se hace en un hilo aparte
+        if not self._cupos.acquire(blocking=False):
+            espera = asyncio.ensure_future(asyncio.to_thread(self._reservar, limite))
+            try:
+                reservado = await asyncio.shield(espera)
+            except asyncio.CancelledError:
+                # El hilo sigue esperando: si llega a obtener el cupo, se devuelve
+                espera.add_done_callback(self._liberar_si_reservado)
+                raise
+            if not reservado:
+                raise self._rechazar()
+
+        futuro = asyncio.wrap_future(self._enviar(funcion, *args))
+        try:
+            return await asyncio.wait_for(futuro, max(0.0, limite - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise self._vencer() from None
+
+    def estadisticas(self) -> dict[str, int]:
+        return {
+            "ejecutadas": self.ejecutadas,
+            "rechazadas": self.rechazadas,
+            "vencidas": self.vencidas,
+        }
+
+    def cerrar(self) -> None:
+        """
+        Cancela los hashes en espera y detiene los workers.
+        """
+        with self._lock:
+            self._cerrado = True
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# Instancia global que usa AuthService
+ejecutor_hashing = EjecutorHashing()
+atexit.register(ejecutor_hashing.cerrar)
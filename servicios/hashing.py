@@ -0,0 +1,163 @@
+# servicios/hashing.py
+
+"""
+Hash de contraseñas con costo configurable.
+
+En usuarios.contrasena se guarda un texto que indica cómo se calculó el
+hash, para poder cambiar de algoritmo o de costo sin invalidar las
+contraseñas existentes:
+
+    pbkdf2_sha256$<iteraciones>$<sal>$<hash>
+    scrypt$<n>$<r>$<p>$<sal>$<hash>
+
+(sal y hash en base64). Los hashes antiguos del proyecto (SHA-256 sin sal,
+64 caracteres hexadecimales) se siguen aceptando al verificar y
+necesita_rehash() siempre los marca para reemplazarlos.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+
+from config import (
+    CONTRASENAS_ALGORITMO,
+    CONTRASENAS_LARGO_SAL,
+    CONTRASENAS_PBKDF2_ITERACIONES,
+    CONTRASENAS_SCRYPT_N,
+    CONTRASENAS_SCRYPT_P,
+    CONTRASENAS_SCRYPT_R,
+)
+
+
+def _b64(datos: bytes) -> str:
+    return base64.b64encode(datos).decode("ascii").rstrip("=")
+
+
+def _desde_b64(texto: str) -> bytes:
+    return base64.b64decode(texto + "=" * (-len(texto) % 4))
+
+
+class Hasher(ABC):
+    """
+    Algoritmo de hash con sus parámetros de costo.
+    """
+    ALGORITMO: str = ""
+
+    def __init__(self, largo_sal: int = CONTRASENAS_LARGO_SAL):
+        self.largo_sal = largo_sal
+
+    @abstractmethod
+    def _derivar(self, password: str, sal: bytes, parametros: list[str]) -> bytes:
+        """Calcula el hash con los 'parametros' guardados junto a él."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _parametros(self) -> list[str]:
+        """Parámetros de costo actuales, tal como se guardan en el hash."""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{self.ALGORITMO}({', '.join(self._parametros())})"
+
+    def hashear(self, password: str) -> str:
+        sal = os.urandom(self.largo_sal)
+        parametros = self._parametros()
+        derivado = self._derivar(password, sal, parametros)
+        return "$".join([self.ALGORITMO, *parametros, _b64(sal), _b64(derivado)])
+
+    def verificar(self, password: str, codificado: str) -> bool:
+        """
+        Compara en tiempo constante. Acepta hashes de este algoritmo con
+        cualquier parámetro de costo.
+        """
+        algoritmo, *parametros, sal, esperado = codificado.split("$")
+        if algoritmo != self.ALGORITMO:
+            raise ValueError(f"El hash no es {self.ALGORITMO}")
+        derivado = self._derivar(password, _desde_b64(sal), parametros)
+        return hmac.compare_digest(derivado, _desde_b64(esperado))
+
+    def necesita_rehash(self, codificado: str) -> bool:
+        """
+        True si el hash se calculó con otro algoritmo o con otro costo.
+        """
+        partes = codificado.split("$")
+        return partes[0] != self.ALGORITMO or partes[1:-2] != self._parametros()
+
+
+class HasherPBKDF2(Hasher):
+    ALGORITMO = "pbkdf2_sha256"
+
+    def __init__(self, iteraciones: int = CONTRASENAS_PBKDF2_ITERACIONES,
+                 largo_sal: int = CONTRASENAS_LARGO_SAL):
+        super().__init__(largo_sal)
+        self.iteraciones = iteraciones
+
+    def _parametros(self) -> list[str]:
+        return [str(self.iteraciones)]
+
+    def _derivar(self, password: str, sal: bytes, parametros: list[str]) -> bytes:
+        (iteraciones,) = parametros
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), sal, int(iteraciones))
+
+
+class HasherScrypt(Hasher):
+    ALGORITMO = "scrypt"
+
+    def __init__(self, n: int = CONTRASENAS_SCRYPT_N, r: int = CONTRASENAS_SCRYPT_R,
+                 p: int = CONTRASENAS_SCRYPT_P, largo_sal: int = CONTRASENAS_LARGO_SAL):
+        super().__init__(largo_sal)
+        self.n, self.r, self.p = n, r, p
+
+    def _parametros(self) -> list[str]:
+        return [str(self.n), str(self.r), str(self.p)]
+
+    def _derivar(self, password: str, sal: bytes, parametros: list[str]) -> bytes:
+        n, r, p = (int(x) for x in parametros)
+        return hashlib.scrypt(
+            password.encode("utf-8"), salt=sal, n=n, r=r, p=p,
+            # El límite por defecto de OpenSSL (32 MB) no alcanza para N altos
+            maxmem=128 * r * (n + p + 2) + 1024 * 1024,
+            dklen=32,
+        )
+
+
+HASHERS: dict[str, type[Hasher]] = {
+    HasherPBKDF2.ALGORITMO: HasherPBKDF2,
+    HasherScrypt.ALGORITMO: HasherScrypt,
+}
+
+
+def crear_hasher(algoritmo: str = CONTRASENAS_ALGORITMO) -> Hasher:
+    """
+    Hasher configurado en config.py para 'algoritmo'.
+    """
+    try:
+        return HASHERS[algoritmo]()
+    except KeyError:
+        raise ValueError(f"Algoritmo de contraseñas desconocido: {algoritmo}") from None
+
+
+def _es_sha256_legado(codificado: str) -> bool:
+    return len(codificado) == 64 and "$" not in codificado
+
+
+def verificar(password: str, codificado: str) -> bool:
+    """
+    Verifica 'password' contra un hash guardado con cualquier algoritmo
+    soportado (incluido el SHA-256 antiguo). Un hash mal formado o de un
+    algoritmo desconocido nunca coincide.
+    """
+    if _es_sha256_legado(codificado):
+        calculado = hashlib.sha256(password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(calculado, codificado)
+
+    algoritmo = codificado.split("$", 1)[0]
+    clase = HASHERS.get(algoritmo)
+    if clase is None:
+        return False
+    try:
+        return clase().verificar(password, codificado)
+    except ValueError:
+        return False
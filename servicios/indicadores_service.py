@@ -1,92 +1,352 @@
-# servicios/plan_service.py
+# servicios/indicadores_service.py
 
 """
-Servicio de negocio para gestionar:
-- Planes
-- Contratos
+Servicio de negocio para consultar indicadores económicos.
+
+Cada consulta se resuelve en este orden (read-through):
+1. Caché LRU en memoria del proceso.
+2. Tabla 'indicadores' (IndicadoresRepositorio).
+3. API externa (IndicadoresClient). El valor obtenido se guarda en la
+   tabla y en el caché para las consultas siguientes.
+
+Los valores de fechas pasadas no cambian y se guardan sin expiración.
+Los de hoy expiran según INDICADORES_TTL_HOY de config.py.
+
+Si muchas consultas concurrentes fallan el caché para el mismo
+(nombre, fecha), solo una va a la BD/API; las demás esperan su resultado.
+
+El registro de consultas (consultas_indicadores) se escribe en lotes desde
+un hilo de fondo (repositorios/escritor_consultas.py).
 """
 
-from datetime import date
-from modelos.plan import Plan
-from modelos.contrato import ContratoPlan
-from repositorios.plan_repo import PlanRepositorio
-from repositorios.contrato_repo import ContratoRepositorio
+import asyncio
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+
+from config import (
+    INDICADORES_CACHE_CAPACIDAD,
+    INDICADORES_TTL_HOY,
+    INDICADORES_TTL_HOY_DEFECTO,
+    INDICADORES_TTL_SIN_DATOS,
+)
+from integraciones.indicadores_client import AsyncIndicadoresClient, IndicadoresClient
+from modelos.indicadores import ConsultaIndicador, IndicadorEconomico
+from repositorios.escritor_consultas import EscritorConsultas, escritor_consultas
+from repositorios.indicadores_repo import IndicadoresRepositorio
+from utilidades.cache import CacheLRU
+from utilidades.single_flight import SingleFlight
+
+# Caché compartido por todas las instancias del servicio
+_cache_indicadores = CacheLRU(INDICADORES_CACHE_CAPACIDAD)
+
+# (nombre, fecha) pasadas sin valor publicado, también compartidas
+_fechas_sin_datos = CacheLRU(INDICADORES_CACHE_CAPACIDAD, ttl=INDICADORES_TTL_SIN_DATOS)
+
+# Cargas en curso por (nombre, fecha), también compartidas
+_cargas_en_curso = SingleFlight()
 
+# Orígenes registrados en consultas_indicadores.fuente
+FUENTE_CACHE = "cache"
+FUENTE_BD = "bd"
+# Esperó la carga en curso de otro hilo (no consultó la BD ni la API)
+FUENTE_COMPARTIDA = "compartida"
 
-class PlanService:
+
+def _tramos(fechas: list[date]) -> list[tuple[date, date]]:
     """
-    Lógica empresarial relacionada a planes y contratos.
+    Agrupa fechas ordenadas en tramos de días consecutivos (desde, hasta).
     """
+    tramos: list[tuple[date, date]] = []
+    for fecha in fechas:
+        if tramos and fecha - tramos[-1][1] == timedelta(days=1):
+            tramos[-1] = (tramos[-1][0], fecha)
+        else:
+            tramos.append((fecha, fecha))
+    return tramos
+
 
-    def __init__(self):
-        self.repo_plan = PlanRepositorio()
-        self.repo_contrato = ContratoRepositorio()
+class IndicadoresService:
+    """
+    Lógica para consultar y guardar indicadores económicos.
+    """
+
+    def __init__(self, client: IndicadoresClient | None = None,
+                 repo: IndicadoresRepositorio | None = None,
+                 cache: CacheLRU | None = None,
+                 cargas: SingleFlight | None = None,
+                 auditoria: EscritorConsultas | None = None,
+                 sin_datos: CacheLRU | None = None):
+        self.client = client or IndicadoresClient()
+        self.repo = repo or IndicadoresRepositorio()
+        self.cache = cache if cache is not None else _cache_indicadores
+        self.cargas = cargas if cargas is not None else _cargas_en_curso
+        self.auditoria = auditoria if auditoria is not None else escritor_consultas
+        self.sin_datos = sin_datos if sin_datos is not None else _fechas_sin_datos
 
     # ---------------------------
-    # PLANES
+    # Utilidades internas
     # ---------------------------
 
-    def crear_plan(self, empresa_id: int, nombre: str, bajada: float, subida: float,
-                   contencion: int, precio: int, descripcion: str = "") -> Plan:
+    def _ttl(self, nombre: str, fecha: date) -> float | None:
+        """
+        Segundos que el valor puede quedar en caché (None = sin expiración).
+        """
+        if fecha < date.today():
+            return None
+        return INDICADORES_TTL_HOY.get(nombre, INDICADORES_TTL_HOY_DEFECTO)
+
+    def _obtener_sin_cache(self, nombre: str, fecha: date) -> tuple[IndicadorEconomico, str]:
         """
-        Crea un plan validando sus datos.
+        Busca el indicador en la BD y, si hace falta, en la API.
+        Retorna (indicador, fuente).
         """
-        if bajada <= 0 or subida <= 0:
-            raise ValueError("Las velocidades deben ser mayores a 0")
+        guardado = self.repo.obtener_por_nombre_y_fecha(nombre, fecha)
 
-        if precio <= 0:
-            raise ValueError("El precio debe ser mayor a 0")
+        # Un valor guardado sirve si es fijo; los de hoy con TTL se refrescan
+        if guardado and self._ttl(nombre, fecha) is None:
+            return guardado, FUENTE_BD
 
-        nuevo = Plan(
-            id=None,
-            empresa_id=empresa_id,
-            nombre=nombre,
-            bajada_mbps=bajada,
-            subida_mbps=subida,
-            contencion=contencion,
-            precio_clp=precio,
-            descripcion=descripcion
-        )
+        try:
+            indicador = self.client.obtener_indicador(nombre, fecha)
+        except Exception:
+            if guardado:
+                # La API falló: mejor un valor algo antiguo que ninguno
+                return guardado, FUENTE_BD
+            raise
+
+        indicador = replace(indicador, id=self.repo.upsert_muchos([indicador])[0])
+        return indicador, self.client.base_url
+
+    def _cargar(self, nombre: str, fecha: date) -> tuple[IndicadorEconomico, str]:
+        """
+        Carga el indicador y lo deja en caché. Se ejecuta una sola vez por
+        (nombre, fecha) aunque lo pidan muchos hilos a la vez.
+        """
+        clave = (nombre, fecha)
+        # Otra carga pudo terminar entre el fallo de caché y este punto
+        indicador = self.cache.obtener(clave)
+        if indicador is not None:
+            return indicador, FUENTE_CACHE
 
-        return self.repo_plan.crear(nuevo)
+        indicador, fuente = self._obtener_sin_cache(nombre, fecha)
+        self.cache.guardar(clave, indicador, ttl=self._ttl(nombre, fecha))
+        return indicador, fuente
 
-    def listar_planes_empresa(self, empresa_id: int) -> list[Plan]:
-        return self.repo_plan.listar_por_empresa(empresa_id)
+    def _guardar(self, indicadores: list[IndicadorEconomico]) -> list[IndicadorEconomico]:
+        """
+        Guarda los indicadores en la BD (un solo upsert) y en el caché.
+        Retorna los indicadores con el id asignado.
+        """
+        ids = self.repo.upsert_muchos(indicadores)
+        guardados = [replace(i, id=indicador_id) for i, indicador_id in zip(indicadores, ids)]
+        for indicador in guardados:
+            self.cache.guardar(
+                (indicador.nombre, indicador.fecha_valor),
+                indicador,
+                ttl=self._ttl(indicador.nombre, indicador.fecha_valor),
+            )
+        return guardados
+
+    def _registrar_consulta(self, indicador: IndicadorEconomico, usuario_id: int,
+                            fuente: str) -> None:
+        self.auditoria.registrar(
+            ConsultaIndicador(
+                id=None,
+                indicador_id=indicador.id,
+                usuario_id=usuario_id,
+                fecha_consulta=datetime.now().replace(microsecond=0),
+                fuente=fuente,
+            )
+        )
 
     # ---------------------------
-    # CONTRATOS
+    # Lógica principal
     # ---------------------------
 
-    def contratar_plan(self, cliente_id: int, plan_id: int) -> ContratoPlan:
+    def obtener_indicador(self, nombre: str, fecha: date | None = None,
+                          usuario_id: int | None = None) -> IndicadorEconomico:
         """
-        Un cliente contrata un plan.
-        Regla: solo puede tener un contrato ACTIVO a la vez.
+        Retorna el valor del indicador 'nombre' ('UF', 'DOLAR', ...) en 'fecha'
+        (hoy si no se indica). Si se pasa 'usuario_id' la consulta queda
+        registrada en consultas_indicadores.
+
+        Lanza las mismas excepciones que IndicadoresClient.obtener_indicador
+        si el valor no está guardado y la API falla.
         """
-        # Buscar contratos activos para el cliente
-        contratos_cliente = self.repo_contrato.listar_por_cliente(cliente_id)
+        nombre = nombre.upper()
+        fecha = fecha or date.today()
+        clave = (nombre, fecha)
 
-        for c in contratos_cliente:
-            if c.estado == "activo":
-                raise ValueError("El cliente ya tiene un contrato activo.")
+        indicador = self.cache.obtener(clave)
+        fuente = FUENTE_CACHE
+        if indicador is None:
+            (indicador, fuente), compartido = self.cargas.hacer_compartido(
+                clave, self._cargar, nombre, fecha
+            )
+            if compartido:
+                fuente = FUENTE_COMPARTIDA
 
-        nuevo_contrato = ContratoPlan(
-            id=None,
-            cliente_id=cliente_id,
-            plan_id=plan_id,
-            fecha_inicio=date.today(),
-            fecha_fin=None,
-            estado="activo"
-        )
+        if usuario_id is not None:
+            self._registrar_consulta(indicador, usuario_id, fuente)
+
+        return indicador
+
+    def obtener_rango(self, nombre: str, desde: date, hasta: date) -> list[IndicadorEconomico]:
+        """
+        Retorna los valores del indicador entre 'desde' y 'hasta' (inclusive),
+        ordenados por fecha.
 
-        return self.repo_contrato.crear(nuevo_contrato)
+        Solo se consulta la API si falta alguna fecha en la BD. Las fechas
+        pasadas que la API no tiene (fines de semana, feriados) no se
+        guardan: se recuerdan en 'sin_datos' para no pedirlas de nuevo.
 
-    def cambiar_estado(self, contrato_id: int, nuevo_estado: str) -> ContratoPlan:
+        Con el endpoint de rangos se hace una sola llamada, de la primera a
+        la última fecha faltante, y solo se guardan las que faltaban. Si la
+        API no tiene ese endpoint, se piden solo las fechas faltantes.
         """
-        Permite suspender, reactivar o finalizar contratos.
+        nombre = nombre.upper()
+        guardados = {
+            i.fecha_valor: i
+            for i in self.repo.listar_por_nombre_y_rango(nombre, desde, hasta)
+        }
+
+        dias = (hasta - desde).days + 1
+        faltantes = [
+            f for f in (desde + timedelta(days=d) for d in range(dias))
+            if (f not in guardados or self._ttl(nombre, f) is not None)
+            and self.sin_datos.obtener((nombre, f)) is None
+        ]
+        if not faltantes:
+            return [guardados[f] for f in sorted(guardados)]
+
+        if self.client.soporta_rango:
+            tramos = [(faltantes[0], faltantes[-1])]
+        else:
+            tramos = _tramos(faltantes)
+        pendientes = set(faltantes)
+        nuevos = [
+            indicador
+            for inicio, fin in tramos
+            for indicador in self.client.obtener_rango(nombre, inicio, fin)
+            if indicador.fecha_valor in pendientes
+        ]
+        if nuevos:
+            guardados.update({i.fecha_valor: i for i in self._guardar(nuevos)})
+
+        hoy = date.today()
+        for fecha in pendientes.difference(guardados):
+            if fecha < hoy:
+                self.sin_datos.guardar((nombre, fecha), True)
+
+        return [guardados[f] for f in sorted(guardados)]
+
+    def obtener_varios(self, nombres: list[str],
+                       fecha: date | None = None) -> dict[str, IndicadorEconomico]:
+        """
+        Retorna {NOMBRE: indicador} para varios indicadores en la misma fecha.
+        Los que no están en caché ni en la BD se piden a la API en paralelo.
+        Los indicadores sin valor para esa fecha no aparecen en el resultado.
+        """
+        fecha = fecha or date.today()
+        resultado = {}
+        pendientes = []
+
+        for nombre in (n.upper() for n in nombres):
+            indicador = self.cache.obtener((nombre, fecha))
+            if indicador is None and self._ttl(nombre, fecha) is None:
+                indicador = self.repo.obtener_por_nombre_y_fecha(nombre, fecha)
+                if indicador:
+                    self.cache.guardar((nombre, fecha), indicador, ttl=None)
+            if indicador is None:
+                pendientes.append(nombre)
+            else:
+                resultado[nombre] = indicador
+
+        if pendientes:
+            nuevos = self.client.obtener_varios(pendientes, fecha)
+            if nuevos:
+                resultado.update((i.nombre, i) for i in self._guardar(list(nuevos.values())))
+
+        return resultado
+
+    def refrescar(self, nombres: list[str], fecha: date) -> list[IndicadorEconomico]:
+        """
+        Pide a la API los indicadores para 'fecha' sin mirar el caché ni la
+        BD, y guarda los resultados en ambos. Lo usa la precarga diaria.
+        """
+        nuevos = list(self.client.obtener_varios(nombres, fecha).values())
+        if nuevos:
+            nuevos = self._guardar(nuevos)
+        return nuevos
+
+    def refrescar_rango(self, nombre: str, desde: date,
+                        hasta: date) -> list[IndicadorEconomico]:
+        """
+        Igual que refrescar(), para un indicador en un rango de fechas.
         """
-        contrato = self.repo_contrato.obtener_por_id(contrato_id)
-        if not contrato:
-            raise ValueError("El contrato no existe.")
+        nuevos = self.client.obtener_rango(nombre, desde, hasta)
+        if nuevos:
+            nuevos = self._guardar(nuevos)
+        return nuevos
+
+    def calentar_cache(self, nombres: list[str], dias: int,
+                       dias_adelante: dict[str, int] | None = None) -> int:
+        """
+        Carga al caché los valores guardados en la BD de los últimos 'dias'
+        días (y de los días futuros ya conocidos). No consulta la API.
+        Retorna cuántos valores se cargaron.
+        """
+        hoy = date.today()
+        dias_adelante = dias_adelante or {}
+        cargados = 0
+
+        for nombre in (n.upper() for n in nombres):
+            hasta = hoy + timedelta(days=dias_adelante.get(nombre, 0))
+            for indicador in self.repo.listar_por_nombre_y_rango(
+                nombre, hoy - timedelta(days=dias), hasta
+            ):
+                self.cache.guardar(
+                    (indicador.nombre, indicador.fecha_valor),
+                    indicador,
+                    ttl=self._ttl(indicador.nombre, indicador.fecha_valor),
+                )
+                cargados += 1
+
+        return cargados
+
+    # ---------------------------
+    # Variante asyncio
+    # ---------------------------
+
+    async def guardar_async(self, indicadores: list[IndicadorEconomico]
+                            ) -> list[IndicadorEconomico]:
+        """
+        Guarda los indicadores (BD + caché) sin bloquear el event loop.
+        Retorna los indicadores con el id asignado.
+        """
+        if not indicadores:
+            return []
+        return await asyncio.to_thread(self._guardar, indicadores)
+
+    async def refrescar_async(self, nombres: list[str], fechas: list[date],
+                              client: AsyncIndicadoresClient | None = None
+                              ) -> list[IndicadorEconomico]:
+        """
+        Pide a la API todos los indicadores 'nombres' para todas las 'fechas'
+        de forma concurrente y los guarda con un solo upsert al final.
+        Retorna los indicadores obtenidos.
+        """
+        propio = client is None
+        if propio:
+            # Comparte la sesión HTTP (y su pool) con el cliente síncrono
+            client = AsyncIndicadoresClient(self.client.base_url, sesion=self.client.sesion,
+                                            soporta_rango=self.client.soporta_rango)
+
+        pares = [(n.upper(), f) for n in nombres for f in fechas]
+        try:
+            indicadores = await client.obtener_muchos(pares)
+        finally:
+            if propio:
+                await client.cerrar(cerrar_sesion=False)
 
-        contrato.estado = nuevo_estado
-        return self.repo_contrato.actualizar(contrato)
+        return await self.guardar_async(indicadores)
@@ -0,0 +1,112 @@
+# servicios/limite_login.py
+
+"""
+Límite de intentos de inicio de sesión.
+
+AuthService consulta LimiteLogin antes de leer la BD o calcular el hash
+de la contraseña, así un cliente que insiste no consume recursos:
+- un balde por nombre de usuario (frena ataques a una cuenta), y
+- un balde por origen (frena a quien prueba muchas cuentas distintas).
+
+Los intentos rechazados lanzan DemasiadosIntentos, que indica en cuántos
+segundos se puede volver a intentar. estadisticas() cuenta los permitidos
+y rechazados de cada limitador.
+
+El estado vive en memoria. Con LOGIN_LIMITE_PERSISTIR se guarda en la
+tabla limites_login al terminar el programa y se restaura al iniciar
+(iniciar_persistencia()).
+"""
+
+import atexit
+import math
+import time
+
+from config import (
+    LOGIN_LIMITE_MAX_CLAVES,
+    LOGIN_LIMITE_ORIGEN,
+    LOGIN_LIMITE_USUARIO,
+)
+from repositorios.limites_login_repo import LimitesLoginRepositorio
+from utilidades.token_bucket import TokenBucket
+
+
+class DemasiadosIntentos(ValueError):
+
+    def __init__(self, reintentar_en: float):
+        super().__init__(
+            "Demasiados intentos de inicio de sesión. "
+            f"Intente de nuevo en {math.ceil(reintentar_en)} segundos."
+        )
+        self.reintentar_en = reintentar_en
+
+
+class LimiteLogin:
+
+    def __init__(self, por_usuario: TokenBucket | None = None,
+                 por_origen: TokenBucket | None = None,
+                 repo: LimitesLoginRepositorio | None = None):
+        self.por_usuario = por_usuario or TokenBucket(*LOGIN_LIMITE_USUARIO,
+                                                      max_claves=LOGIN_LIMITE_MAX_CLAVES)
+        self.por_origen = por_origen or TokenBucket(*LOGIN_LIMITE_ORIGEN,
+                                                    max_claves=LOGIN_LIMITE_MAX_CLAVES)
+        self.repo = repo or LimitesLoginRepositorio()
+
+    def verificar(self, nombre_usuario: str, origen: str | None = None) -> None:
+        """
+        Registra un intento. Lanza DemasiadosIntentos si el usuario o el
+        origen superaron su límite.
+        """
+        if origen is not None:
+            espera = self.por_origen.consumir(origen)
+            if espera:
+                raise DemasiadosIntentos(espera)
+
+        espera = self.por_usuario.consumir(nombre_usuario.lower())
+        if espera:
+            raise DemasiadosIntentos(espera)
+
+    def exito(self, nombre_usuario: str) -> None:
+        """
+        Login correcto: los intentos fallidos previos del usuario no cuentan.
+        """
+        self.por_usuario.reiniciar(nombre_usuario.lower())
+
+    def estadisticas(self) -> dict[str, dict[str, int]]:
+        return {
+            "usuario": self.por_usuario.estadisticas(),
+            "origen": self.por_origen.estadisticas(),
+        }
+
+    # ---------- Persistencia ----------
+
+    def guardar(self) -> None:
+        ahora = time.time()
+        filas = [
+            (f"{prefijo}:{clave}", fichas, ahora - antiguedad)
+            for prefijo, balde in (("usuario", self.por_usuario), ("origen", self.por_origen))
+            for clave, fichas, antiguedad in balde.exportar()
+        ]
+        self.repo.reemplazar(filas)
+
+    def cargar(self) -> None:
+        ahora = time.time()
+        estado: dict[str, list] = {"usuario": [], "origen": []}
+        for clave, fichas, actualizado in self.repo.listar():
+            prefijo, _, nombre = clave.partition(":")
+            if prefijo in estado:
+                estado[prefijo].append((nombre, fichas, max(0.0, ahora - actualizado)))
+        self.por_usuario.importar(estado["usuario"])
+        self.por_origen.importar(estado["origen"])
+
+
+# Instancia global que usa AuthService
+limite_login = LimiteLogin()
+
+
+def iniciar_persistencia() -> None:
+    """
+    Restaura los límites guardados y los guarda al terminar el programa.
+    Se llama después de migrar la BD.
+    """
+    limite_login.cargar()
+    atexit.register(limite_login.guardar)
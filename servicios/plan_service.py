@@ -6,11 +6,13 @@ Servicio de negocio para gestionar:
 - Contratos
 """
 
+import sqlite3
 from datetime import date
 from modelos.plan import Plan
-from modelos.contrato import ContratoPlan
-from repositorios.plan_repo import PlanRepositorio
+from modelos.contrato import ContratoDetalle, ContratoPlan
+from repositorios.plan_repo import PlanRepositorioCacheado
 from repositorios.contrato_repo import ContratoRepositorio
+from db.connection import db
 
 
 class PlanService:
@@ -19,7 +21,7 @@ class PlanService:
     """
 
     def __init__(self):
-        self.repo_plan = PlanRepositorio()
+        self.repo_plan = PlanRepositorioCacheado()
         self.repo_contrato = ContratoRepositorio()
 
     # ---------------------------
@@ -61,32 +63,57 @@ class PlanService:
         """
         Un cliente contrata un plan.
         Regla: solo puede tener un contrato ACTIVO a la vez.
-        """
-        # Buscar contratos activos para el cliente
-        contratos_cliente = self.repo_contrato.listar_por_cliente(cliente_id)
 
-        for c in contratos_cliente:
-            if c.estado == "activo":
+        La verificación y el insert van en la misma transacción, así dos
+        contrataciones simultáneas no pueden ver ambas "sin contrato activo".
+        Además la base de datos la garantiza con un índice único parcial.
+        """
+        with db.transaccion():
+            if self.repo_contrato.tiene_contrato_activo(cliente_id):
                 raise ValueError("El cliente ya tiene un contrato activo.")
 
-        nuevo_contrato = ContratoPlan(
-            id=None,
-            cliente_id=cliente_id,
-            plan_id=plan_id,
-            fecha_inicio=date.today(),
-            fecha_fin=None,
-            estado="activo"
-        )
-
-        return self.repo_contrato.crear(nuevo_contrato)
+            nuevo_contrato = ContratoPlan(
+                id=None,
+                cliente_id=cliente_id,
+                plan_id=plan_id,
+                fecha_inicio=date.today(),
+                fecha_fin=None,
+                estado="activo"
+            )
+
+            try:
+                return self.repo_contrato.crear(nuevo_contrato)
+            except sqlite3.IntegrityError as e:
+                if _es_contrato_activo_duplicado(e):
+                    raise ValueError("El cliente ya tiene un contrato activo.") from e
+                raise
+
+    def listar_contratos_cliente(self, cliente_id: int) -> list[ContratoDetalle]:
+        """
+        Contratos del cliente con los datos de su plan y empresa.
+        """
+        return self.repo_contrato.listar_contratos_detallados(cliente_id)
 
     def cambiar_estado(self, contrato_id: int, nuevo_estado: str) -> ContratoPlan:
         """
         Permite suspender, reactivar o finalizar contratos.
         """
-        contrato = self.repo_contrato.obtener_por_id(contrato_id)
-        if not contrato:
-            raise ValueError("El contrato no existe.")
+        with db.transaccion():
+            contrato = self.repo_contrato.obtener_por_id(contrato_id)
+            if not contrato:
+                raise ValueError("El contrato no existe.")
+
+            contrato.estado = nuevo_estado
+            try:
+                return self.repo_contrato.actualizar(contrato)
+            except sqlite3.IntegrityError as e:
+                if _es_contrato_activo_duplicado(e):
+                    raise ValueError("El cliente ya tiene un contrato activo.") from e
+                raise
+
 
-        contrato.estado = nuevo_estado
-        return self.repo_contrato.actualizar(contrato)
+def _es_contrato_activo_duplicado(error: sqlite3.IntegrityError) -> bool:
+    """
+    True si el error viene del índice único de contratos activos por cliente.
+    """
+    return "UNIQUE constraint failed: contratos.cliente_id" in str(error)
@@ -0,0 +1,143 @@
+# servicios/precarga_indicadores.py
+
+"""
+Precarga de indicadores económicos.
+
+- precargar(): trae de la API los indicadores de hoy (INDICADORES_PRECARGA)
+  y los días futuros ya publicados (INDICADORES_DIAS_ADELANTE), y los
+  guarda en la tabla 'indicadores' y en el caché.
+- PrecargaDiaria: hilo de fondo que ejecuta precargar() todos los días a
+  INDICADORES_HORA_PRECARGA.
+
+Así ninguna consulta de un usuario tiene que esperar a la API externa.
+
+Uso desde consola:
+    python -m servicios.precarga_indicadores            # una vez y termina
+    python -m servicios.precarga_indicadores --diario   # queda programada
+"""
+
+import argparse
+import threading
+from datetime import date, datetime, time, timedelta
+
+from config import (
+    INDICADORES_DIAS_ADELANTE,
+    INDICADORES_HORA_PRECARGA,
+    INDICADORES_PRECARGA,
+)
+from db.init_db import init_db
+from servicios.indicadores_service import IndicadoresService
+
+
+def precargar(service: IndicadoresService | None = None,
+              nombres: list[str] = INDICADORES_PRECARGA,
+              dias_adelante: dict[str, int] = INDICADORES_DIAS_ADELANTE,
+              hoy: date | None = None) -> dict[str, int]:
+    """
+    Ejecuta una precarga completa. Un error en un indicador no detiene
+    a los demás: se informa y se sigue.
+
+    Retorna {NOMBRE: cantidad de valores guardados}.
+    """
+    service = service or IndicadoresService()
+    hoy = hoy or date.today()
+    guardados = {n.upper(): 0 for n in nombres}
+
+    try:
+        for indicador in service.refrescar(nombres, hoy):
+            guardados[indicador.nombre] = guardados.get(indicador.nombre, 0) + 1
+    except Exception as e:
+        print(f"❌ Precarga de indicadores para {hoy}: {e}")
+
+    for nombre, dias in dias_adelante.items():
+        if dias <= 0:
+            continue
+        try:
+            nuevos = service.refrescar_rango(
+                nombre, hoy + timedelta(days=1), hoy + timedelta(days=dias)
+            )
+            guardados[nombre.upper()] = guardados.get(nombre.upper(), 0) + len(nuevos)
+        except Exception as e:
+            print(f"❌ Precarga de {nombre} para los próximos {dias} días: {e}")
+
+    return guardados
+
+
+def segundos_hasta(hora: str, ahora: datetime | None = None) -> float:
+    """
+    Segundos que faltan para la próxima vez que el reloj marque 'hora' ("HH:MM").
+    """
+    ahora = ahora or datetime.now()
+    objetivo = datetime.combine(ahora.date(), time.fromisoformat(hora))
+    if objetivo <= ahora:
+        objetivo += timedelta(days=1)
+    return (objetivo - ahora).total_seconds()
+
+
+class PrecargaDiaria:
+    """
+    Ejecuta precargar() en un hilo de fondo todos los días a la hora dada.
+    """
+
+    def __init__(self, hora: str = INDICADORES_HORA_PRECARGA,
+                 service: IndicadoresService | None = None):
+        self.hora = hora
+        self.service = service
+        self._detener = threading.Event()
+        self._hilo: threading.Thread | None = None
+
+    def _bucle(self) -> None:
+        while not self._detener.wait(segundos_hasta(self.hora)):
+            resumen = precargar(self.service)
+            print(f"Precarga de indicadores: {resumen}")
+
+    def iniciar(self) -> None:
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._bucle, name="precarga-indicadores", daemon=True
+        )
+        self._hilo.start()
+
+    def esperar(self) -> None:
+        """
+        Bloquea hasta que el hilo termine (es decir, hasta detener()).
+        """
+        if self._hilo is not None:
+            self._hilo.join()
+
+    def detener(self) -> None:
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precarga de indicadores económicos")
+    parser.add_argument(
+        "--diario",
+        action="store_true",
+        help=f"precargar ahora y luego todos los días a las {INDICADORES_HORA_PRECARGA}",
+    )
+    args = parser.parse_args()
+
+    # Igual que main.py: la BD debe estar en la última versión del esquema
+    init_db()
+
+    print(f"Precarga de indicadores: {precargar()}")
+    if not args.diario:
+        return
+
+    precarga = PrecargaDiaria()
+    precarga.iniciar()
+    print("Precarga diaria programada. Ctrl+C para terminar.")
+    try:
+        precarga.esperar()
+    except KeyboardInterrupt:
+        precarga.detener()
+
+
+if __name__ == "__main__":
+    main()
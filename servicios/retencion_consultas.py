@@ -0,0 +1,105 @@
+# servicios/retencion_consultas.py
+
+"""
+Retención del registro de consultas de indicadores.
+
+consultas_indicadores crece una fila por consulta. Este job:
+1. Resume por (usuario, indicador, día) las consultas de más de
+   RETENCION_DIAS días en consultas_indicadores_diarias.
+2. Las borra en lotes de RETENCION_TAMANO_LOTE, cada uno en su propia
+   transacción corta y con una pausa entre lotes, para no bloquear a los
+   demás escritores.
+3. Devuelve al disco las páginas liberadas (PRAGMA incremental_vacuum).
+
+Uso desde consola:
+    python -m servicios.retencion_consultas
+    python -m servicios.retencion_consultas --dias 30
+    python -m servicios.retencion_consultas --habilitar-vacuum   # una vez, BD antiguas
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from config import (
+    RETENCION_DIAS,
+    RETENCION_PAGINAS_VACUUM,
+    RETENCION_PAUSA,
+    RETENCION_TAMANO_LOTE,
+)
+from db.connection import db
+from db.init_db import init_db
+from repositorios.indicadores_repo import IndicadoresRepositorio
+
+
+@dataclass
+class ResultadoRetencion:
+    compactadas: int
+    lotes: int
+    paginas_liberadas: int
+    segundos: float
+
+
+def compactar_consultas(dias_retencion: int = RETENCION_DIAS,
+                        tamano_lote: int = RETENCION_TAMANO_LOTE,
+                        pausa: float = RETENCION_PAUSA,
+                        paginas_vacuum: int | None = RETENCION_PAGINAS_VACUUM,
+                        repo: IndicadoresRepositorio | None = None,
+                        ahora: datetime | None = None) -> ResultadoRetencion:
+    """
+    Compacta las consultas anteriores a 'dias_retencion' días y libera el
+    espacio que ocupaban.
+    """
+    repo = repo or IndicadoresRepositorio()
+    antes_de = (ahora or datetime.now()) - timedelta(days=dias_retencion)
+    inicio = time.perf_counter()
+
+    compactadas = lotes = 0
+    while True:
+        n = repo.compactar_consultas_lote(antes_de, tamano_lote)
+        if n == 0:
+            break
+        compactadas += n
+        lotes += 1
+        if n < tamano_lote:
+            break
+        time.sleep(pausa)
+
+    paginas = db.vacuum_incremental(paginas_vacuum) if compactadas else 0
+    return ResultadoRetencion(compactadas, lotes, paginas, time.perf_counter() - inicio)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Retención de consultas de indicadores")
+    parser.add_argument(
+        "--dias",
+        type=int,
+        default=RETENCION_DIAS,
+        help=f"días de consultas que se conservan sin resumir (por defecto {RETENCION_DIAS})",
+    )
+    parser.add_argument(
+        "--habilitar-vacuum",
+        action="store_true",
+        help="activar auto_vacuum incremental en una BD existente (ejecuta VACUUM completo)",
+    )
+    args = parser.parse_args()
+
+    # Igual que main.py: la BD debe estar en la última versión del esquema
+    init_db()
+
+    if args.habilitar_vacuum:
+        if db.habilitar_vacuum_incremental():
+            print("auto_vacuum incremental activado.")
+        else:
+            print("auto_vacuum incremental ya estaba activado.")
+
+    r = compactar_consultas(args.dias)
+    print(
+        f"Consultas compactadas: {r.compactadas} en {r.lotes} lotes, "
+        f"{r.paginas_liberadas} páginas liberadas ({r.segundos:.2f} s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# servicios/sesiones.py
+
+"""
+Tokens de sesión firmados.
+
+Después de autenticar al usuario una vez, se le entrega un token con su
+id, nombre, rol y vencimiento, firmado con HMAC-SHA256:
+
+    <datos en base64>.<firma en base64>
+
+Validar un token solo recalcula la firma y revisa el vencimiento: no lee
+la tabla 'usuarios' ni calcula hashes de contraseñas. El rol viaja dentro
+del token para poder autorizar con exigir_rol().
+
+Un cambio de rol o de contraseña no afecta a los tokens ya emitidos hasta
+que vencen; revocar() invalida un token concreto (por ejemplo al cerrar
+sesión) en este proceso.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from datetime import datetime
+
+from config import SESIONES_CLAVE, SESIONES_DURACION
+from modelos.sesion import Sesion
+from modelos.usuario import RolUsuario, Usuario
+
+
+class SesionInvalida(ValueError):
+    """El token está mal formado, tiene una firma incorrecta, venció o fue revocado."""
+
+
+def _b64(datos: bytes) -> str:
+    return base64.urlsafe_b64encode(datos).decode("ascii").rstrip("=")
+
+
+def _desde_b64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+class ServicioSesiones:
+
+    def __init__(self, clave: str | bytes | None = SESIONES_CLAVE,
+                 duracion: float = SESIONES_DURACION):
+        if clave is None:
+            clave = secrets.token_bytes(32)
+        self._clave = clave.encode("utf-8") if isinstance(clave, str) else clave
+        self.duracion = duracion
+
+        # id de token revocado -> momento en que vence (time.time())
+        self._revocados: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.emitidas = 0
+        self.rechazadas = 0
+
+    # ---------------------------
+    # Utilidades internas
+    # ---------------------------
+
+    def _firmar(self, datos: str) -> str:
+        return _b64(hmac.new(self._clave, datos.encode("ascii"), hashlib.sha256).digest())
+
+    def _rechazar(self, motivo: str) -> SesionInvalida:
+        self.rechazadas += 1
+        return SesionInvalida(motivo)
+
+    # ---------------------------
+    # Lógica principal
+    # ---------------------------
+
+    def emitir(self, usuario: Usuario) -> str:
+        """
+        Crea un token para el usuario ya autenticado.
+        """
+        contenido = {
+            "jti": secrets.token_hex(8),
+            "sub": usuario.id,
+            "usr": usuario.nombre_usuario,
+            "rol": RolUsuario(usuario.rol).value,
+            "exp": int(time.time() + self.duracion),
+        }
+        datos = _b64(json.dumps(contenido, separators=(",", ":")).encode("utf-8"))
+        self.emitidas += 1
+        return f"{datos}.{self._firmar(datos)}"
+
+    def validar(self, token: str) -> Sesion:
+        """
+        Retorna la sesión del token. Lanza SesionInvalida si no es válido.
+        """
+        datos, separador, firma = token.partition(".")
+        if (not token.isascii() or not separador
+                or not hmac.compare_digest(firma, self._firmar(datos))):
+            raise self._rechazar("Token de sesión inválido")
+
+        contenido = json.loads(_desde_b64(datos))
+        if contenido["exp"] <= time.time():
+            raise self._rechazar("La sesión expiró")
+        if contenido["jti"] in self._revocados:
+            raise self._rechazar("La sesión fue cerrada")
+
+        return Sesion(
+            id=contenido["jti"],
+            usuario_id=contenido["sub"],
+            nombre_usuario=contenido["usr"],
+            rol=RolUsuario(contenido["rol"]),
+            expira=datetime.fromtimestamp(contenido["exp"]),
+        )
+
+    def exigir_rol(self, token: str, *roles: RolUsuario) -> Sesion:
+        """
+        Valida el token y que su rol sea uno de 'roles'.
+        Lanza SesionInvalida o PermissionError.
+        """
+        sesion = self.validar(token)
+        if sesion.rol not in roles:
+            raise PermissionError(f"El rol {sesion.rol.value} no tiene acceso a esta operación")
+        return sesion
+
+    def revocar(self, token: str) -> None:
+        """
+        Invalida el token (cerrar sesión). Los revocados se recuerdan solo
+        hasta que vencen. Un token que ya no es válido se ignora.
+        """
+        try:
+            sesion = self.validar(token)
+        except SesionInvalida:
+            return
+        ahora = time.time()
+        with self._lock:
+            self._revocados = {j: v for j, v in self._revocados.items() if v > ahora}
+            self._revocados[sesion.id] = sesion.expira.timestamp()
+
+
+# Instancia global: todos los servicios validan con la misma clave
+servicio_sesiones = ServicioSesiones()
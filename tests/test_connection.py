@@ -0,0 +1,51 @@
+# tests/test_connection.py
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from db.connection import DatabaseConnection
+
+
+class TransaccionTest(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.db = DatabaseConnection(Path(carpeta.name) / "transaccion.db", pool_size=0)
+        with self.db.get_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+    def valores(self) -> list[int]:
+        with self.db.get_connection() as conn:
+            return [x for (x,) in conn.execute("SELECT x FROM t ORDER BY x")]
+
+    def test_dentro_de_get_connection_abre_begin_immediate(self):
+        with self.db.get_connection() as conn:
+            with self.db.transaccion() as actual:
+                self.assertIs(actual, conn)
+                self.assertTrue(conn.in_transaction)
+                conn.execute("INSERT INTO t VALUES (1)")
+        self.assertEqual(self.valores(), [1])
+
+    def test_transaccion_anidada_se_une_a_la_externa(self):
+        with self.assertRaises(KeyError):
+            with self.db.transaccion() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                with self.db.transaccion() as anidada:
+                    self.assertIs(anidada, conn)
+                    anidada.execute("INSERT INTO t VALUES (2)")
+                raise KeyError
+        self.assertEqual(self.valores(), [])
+
+    def test_con_una_transaccion_implicita_abierta_lanza_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.db.get_connection() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                with self.db.transaccion():
+                    pass
+        self.assertEqual(self.valores(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+# tests/test_ejecutor_hashing.py
+
+import asyncio
+import threading
+import unittest
+
+from servicios.ejecutor_hashing import EjecutorHashing
+
+
+class EjecutorHashingCancelacionTest(unittest.TestCase):
+
+    def test_cancelar_mientras_espera_cupo_no_pierde_el_cupo(self):
+        ejecutor = EjecutorHashing(modo="hilos", workers=1, cola=0, timeout=5)
+        self.addCleanup(ejecutor.cerrar)
+        liberar = threading.Event()
+
+        async def escenario():
+            primera = asyncio.create_task(ejecutor.ejecutar_async(liberar.wait))
+            await asyncio.sleep(0.05)
+
+            # La segunda espera un cupo en un hilo aparte y se cancela
+            segunda = asyncio.create_task(ejecutor.ejecutar_async(lambda: "segunda"))
+            await asyncio.sleep(0.05)
+            segunda.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await segunda
+
+            liberar.set()
+            await primera
+
+            # El cupo que tomó el hilo de la solicitud cancelada vuelve al ejecutor
+            for i in range(3):
+                self.assertEqual(await ejecutor.ejecutar_async(lambda i=i: i), i)
+
+        asyncio.run(escenario())
+        self.assertEqual(ejecutor.rechazadas, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# tests/test_indicadores_service.py
+
+import sqlite3
+import unittest
+from datetime import date, timedelta
+
+from db.connection import db
+from db.migrador import aplicar_migraciones
+from modelos.indicadores import IndicadorEconomico
+from servicios.indicadores_service import IndicadoresService
+from utilidades.cache import CacheLRU
+
+
+class ClienteFalso:
+    """Publica valores solo de lunes a viernes, como la API real."""
+    base_url = "http://falso"
+    soporta_rango = True
+
+    def __init__(self):
+        self.llamadas = 0
+
+    def obtener_rango(self, nombre, desde, hasta):
+        self.llamadas += 1
+        dias = (desde + timedelta(days=d) for d in range((hasta - desde).days + 1))
+        return [IndicadorEconomico(None, nombre, f, 1.0) for f in dias if f.weekday() < 5]
+
+
+class ObtenerRangoTest(unittest.TestCase):
+
+    def setUp(self):
+        conn = sqlite3.connect(":memory:")
+        aplicar_migraciones(conn)
+        self.addCleanup(conn.close)
+        usando = db.usando(conn)
+        usando.__enter__()
+        self.addCleanup(usando.__exit__, None, None, None)
+
+        self.cliente = ClienteFalso()
+        self.servicio = IndicadoresService(
+            client=self.cliente, cache=CacheLRU(1000), sin_datos=CacheLRU(1000)
+        )
+
+    def test_repetir_un_rango_guardado_no_consulta_la_api(self):
+        desde, hasta = date(2024, 1, 1), date(2024, 12, 31)
+        primera = self.servicio.obtener_rango("UF", desde, hasta)
+        segunda = self.servicio.obtener_rango("UF", desde, hasta)
+
+        self.assertEqual(self.cliente.llamadas, 1)
+        self.assertEqual(len(primera), 262)
+        self.assertEqual(segunda, primera)
+
+    def test_solo_se_guardan_las_fechas_que_faltaban(self):
+        self.servicio.obtener_rango("UF", date(2024, 3, 4), date(2024, 3, 8))
+        self.servicio.obtener_rango("UF", date(2024, 3, 1), date(2024, 3, 15))
+
+        self.assertEqual(self.cliente.llamadas, 2)
+        self.assertEqual(
+            len(self.servicio.obtener_rango("UF", date(2024, 3, 1), date(2024, 3, 15))), 11
+        )
+        self.assertEqual(self.cliente.llamadas, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+# tests/test_migrador.py
+
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from db.migrador import _aplicar_script, aplicar_migraciones, listar_migraciones, version_actual
+
+
+class MigracionesConcurrentesTest(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.db_path = str(Path(carpeta.name) / "migraciones.db")
+
+    def conectar(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self.addCleanup(conn.close)
+        return conn
+
+    def test_no_reaplica_una_migracion_aplicada_mientras_se_esperaba_el_lock(self):
+        # 'lenta' leyó user_version antes de que 'rapida' migrara
+        lenta, rapida = self.conectar(), self.conectar()
+        aplicar_migraciones(rapida)
+        ultima = version_actual(rapida)
+
+        version, ruta = listar_migraciones()[0]
+        self.assertFalse(_aplicar_script(lenta, ruta.read_text(encoding="utf-8"), version))
+        self.assertEqual(version_actual(lenta), ultima)
+
+    def test_dos_procesos_a_la_vez_aplican_cada_migracion_una_sola_vez(self):
+        conexiones = [self.conectar(), self.conectar()]
+        barrera = threading.Barrier(len(conexiones))
+        aplicadas = []
+
+        def migrar(conn):
+            barrera.wait()
+            aplicadas.extend(m.version for m in aplicar_migraciones(conn))
+
+        hilos = [threading.Thread(target=migrar, args=(c,)) for c in conexiones]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        # schema.sql (versión 0) es idempotente y puede correr en ambos
+        migraciones = sorted(v for v in aplicadas if v > 0)
+        self.assertEqual(migraciones, [v for v, _ in listar_migraciones()])
+
+
+if __name__ == "__main__":
+    unittest.main()
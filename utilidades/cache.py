@@ -0,0 +1,102 @@
+# utilidades/cache.py
+
+"""
+Caché en memoria LRU con expiración opcional por entrada.
+
+Lo usan los servicios y repositorios que necesitan evitar consultas
+repetidas (indicadores, catálogo, credenciales, ...). Es seguro usarlo
+desde varios hilos.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class CacheLRU:
+    """
+    Guarda hasta 'capacidad' valores. Al llenarse descarta el usado hace
+    más tiempo. Cada entrada puede tener su propio TTL en segundos
+    (None = no expira; solo sale por LRU o invalidación).
+
+    No se pueden guardar valores None: obtener() usa None para "no está".
+
+    'generacion' aumenta con cada invalidación. Quien lee un valor de la BD
+    puede anotarla antes de leer y pasarla a guardar(): si entretanto hubo
+    una invalidación, el valor (posiblemente antiguo) no se guarda.
+    """
+
+    def __init__(self, capacidad: int, ttl: float | None = None):
+        if capacidad <= 0:
+            raise ValueError("La capacidad del caché debe ser mayor a 0")
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generacion = 0
+        self._datos: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Hashable) -> Any | None:
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None:
+                valor, expira = entrada
+                if expira is None or expira > time.monotonic():
+                    self._datos.move_to_end(clave)
+                    self.hits += 1
+                    return valor
+                del self._datos[clave]
+            self.misses += 1
+            return None
+
+    def guardar(self, clave: Hashable, valor: Any, ttl: float | None = ...,
+                generacion: int | None = None) -> None:
+        """
+        Guarda 'valor'. Si no se indica 'ttl' se usa el del caché.
+        Si se indica 'generacion' y ya no es la actual, no guarda nada.
+        """
+        if valor is None:
+            raise ValueError("No se puede guardar None en el caché")
+        if ttl is ...:
+            ttl = self.ttl
+        expira = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if generacion is not None and generacion != self.generacion:
+                return
+            self._datos[clave] = (valor, expira)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def invalidar(self, clave: Hashable) -> None:
+        with self._lock:
+            self._datos.pop(clave, None)
+            self.generacion += 1
+
+    def invalidar_si(self, condicion: Callable[[Hashable, Any], bool]) -> int:
+        """
+        Elimina las entradas para las que condicion(clave, valor) es True.
+        Recorre todo el caché: pensado para operaciones poco frecuentes.
+        """
+        with self._lock:
+            claves = [c for c, (v, _) in self._datos.items() if condicion(c, v)]
+            for c in claves:
+                del self._datos[c]
+            self.generacion += 1
+        return len(claves)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self.generacion += 1
+
+    def estadisticas(self) -> dict[str, int]:
+        with self._lock:
+            return {"entradas": len(self._datos), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._datos)
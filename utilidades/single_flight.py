@@ -0,0 +1,62 @@
+# utilidades/single_flight.py
+
+"""
+Agrupación de llamadas concurrentes iguales ("single flight").
+
+Si varios hilos piden al mismo tiempo la misma clave, solo el primero
+ejecuta la función; los demás esperan y reciben el mismo resultado (o la
+misma excepción). Sirve para que una ráfaga de fallos de caché sobre el
+mismo dato genere una sola consulta a la API o a la BD.
+"""
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._en_curso: dict[Hashable, Future] = {}
+        self.ejecutadas = 0
+        self.compartidas = 0
+
+    def hacer(self, clave: Hashable, funcion: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Ejecuta funcion(*args, **kwargs), salvo que ya haya una ejecución en
+        curso para 'clave': en ese caso espera su resultado.
+        """
+        return self.hacer_compartido(clave, funcion, *args, **kwargs)[0]
+
+    def hacer_compartido(self, clave: Hashable, funcion: Callable[..., Any],
+                         *args, **kwargs) -> tuple[Any, bool]:
+        """
+        Igual que hacer(), pero retorna (resultado, compartido): 'compartido'
+        es True si el resultado vino de la ejecución de otro hilo.
+        """
+        with self._lock:
+            futuro = self._en_curso.get(clave)
+            lider = futuro is None
+            if lider:
+                futuro = Future()
+                self._en_curso[clave] = futuro
+                self.ejecutadas += 1
+            else:
+                self.compartidas += 1
+
+        if not lider:
+            return futuro.result(), True
+
+        try:
+            resultado = funcion(*args, **kwargs)
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        else:
+            futuro.set_result(resultado)
+            return resultado, False
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
@@ -0,0 +1,101 @@
+# utilidades/token_bucket.py
+
+"""
+Limitador de frecuencia "token bucket" por clave, en memoria.
+
+Cada clave tiene un balde de hasta 'capacidad' fichas que se rellena a
+'por_segundo' fichas por segundo. Cada operación gasta una ficha; sin
+fichas, se rechaza. Permite ráfagas cortas de hasta 'capacidad'
+operaciones y limita el ritmo sostenido. Es seguro usarlo desde varios
+hilos.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+
+
+class TokenBucket:
+    """
+    Baldes por clave. Se guardan como máximo 'max_claves': al superarlo se
+    descarta el balde usado hace más tiempo (equivale a dejarlo lleno).
+    """
+
+    def __init__(self, capacidad: float, por_segundo: float, max_claves: int = 100_000):
+        if capacidad < 1 or por_segundo <= 0:
+            raise ValueError("El balde necesita capacidad >= 1 y recarga > 0")
+        self.capacidad = capacidad
+        self.por_segundo = por_segundo
+        self.max_claves = max_claves
+        # clave -> (fichas, momento de la última actualización en time.monotonic())
+        self._baldes: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.permitidas = 0
+        self.rechazadas = 0
+
+    def _fichas(self, clave: Hashable, ahora: float) -> float:
+        entrada = self._baldes.get(clave)
+        if entrada is None:
+            return self.capacidad
+        fichas, ultimo = entrada
+        return min(self.capacidad, fichas + (ahora - ultimo) * self.por_segundo)
+
+    def consumir(self, clave: Hashable) -> float:
+        """
+        Gasta una ficha de 'clave'. Retorna 0 si se pudo; si no, los
+        segundos que faltan para que haya una ficha disponible.
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            fichas = self._fichas(clave, ahora)
+            if fichas < 1:
+                self.rechazadas += 1
+                return (1 - fichas) / self.por_segundo
+
+            self._baldes[clave] = (fichas - 1, ahora)
+            self._baldes.move_to_end(clave)
+            while len(self._baldes) > self.max_claves:
+                self._baldes.popitem(last=False)
+            self.permitidas += 1
+            return 0.0
+
+    def reiniciar(self, clave: Hashable) -> None:
+        """
+        Deja lleno el balde de 'clave'.
+        """
+        with self._lock:
+            self._baldes.pop(clave, None)
+
+    def exportar(self) -> list[tuple[Hashable, float, float]]:
+        """
+        Estado de los baldes que no están llenos: (clave, fichas, segundos
+        desde la última actualización).
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            return [
+                (clave, fichas, ahora - ultimo)
+                for clave, (fichas, ultimo) in self._baldes.items()
+                if self._fichas(clave, ahora) < self.capacidad
+            ]
+
+    def importar(self, estado: Iterable[tuple[Hashable, float, float]]) -> None:
+        """
+        Restaura baldes exportados con exportar().
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            for clave, fichas, antiguedad in estado:
+                self._baldes[clave] = (fichas, ahora - antiguedad)
+                self._baldes.move_to_end(clave)
+            while len(self._baldes) > self.max_claves:
+                self._baldes.popitem(last=False)
+
+    def estadisticas(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "claves": len(self._baldes),
+                "permitidas": self.permitidas,
+                "rechazadas": self.rechazadas,
+            }